@@ -5,22 +5,102 @@ Command-line interface for the seek-core package.
 This script provides a simple way to use the seek-core package from the command line.
 """
 import os
+import re
 import sys
-import json
 import argparse
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from seek_core import generate_learning_plan
+from seek_core import generate_learning_plan_json
 from seek_core.models.schemas import LearnerProfile
 
 
-def parse_args() -> argparse.Namespace:
+# Flags understood by the fast path, mapped to their argument names
+_FAST_FLAGS = {
+    "--age": "age",
+    "--grade-level": "grade_level",
+    "--learning-style": "learning_style",
+    "--known-topics": "known_topics",
+    "--struggles": "struggles",
+    "--goal": "goal",
+    "--output": "output",
+}
+_REQUIRED_ARGS = ("age", "grade_level", "learning_style", "goal")
+
+# Splits comma-separated lists, consuming the whitespace around each comma
+_LIST_SEPARATOR = re.compile(r"\s*,\s*")
+
+# Write buffer for --output files, so large plans are written in few syscalls
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def _fast_parse_args(argv: List[str]) -> Optional[argparse.Namespace]:
+    """
+    Parse well-formed command-line arguments without building an ArgumentParser.
+    
+    Args:
+        argv (List[str]): The command-line arguments, without the program name
+    
+    Returns:
+        Optional[argparse.Namespace]: The parsed arguments, or None if the
+            arguments need the full parser (help, unknown flags, errors)
+    """
+    values = {
+        "age": None,
+        "grade_level": None,
+        "learning_style": None,
+        "known_topics": "",
+        "struggles": "",
+        "goal": None,
+        "output": None,
+        "pretty": False,
+    }
+    
+    i = 0
+    while i < len(argv):
+        flag = argv[i]
+        if flag == "--pretty":
+            values["pretty"] = True
+            i += 1
+            continue
+        
+        name = _FAST_FLAGS.get(flag)
+        if name is None or i + 1 >= len(argv) or argv[i + 1].startswith("-"):
+            return None
+        values[name] = argv[i + 1]
+        i += 2
+    
+    if any(values[name] is None for name in _REQUIRED_ARGS):
+        return None
+    
+    try:
+        values["age"] = int(values["age"])
+        values["grade_level"] = int(values["grade_level"])
+    except ValueError:
+        return None
+    
+    return argparse.Namespace(**values)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     """
     Parse command-line arguments.
     
+    Well-formed invocations are parsed directly; anything else (including
+    --help and invalid input) goes through argparse for its help and errors.
+    
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv[1:].
+    
     Returns:
         argparse.Namespace: The parsed arguments
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    args = _fast_parse_args(argv)
+    if args is not None:
+        return args
+    
     parser = argparse.ArgumentParser(
         description="Generate personalized learning plans for students"
     )
@@ -74,7 +154,22 @@ def parse_args() -> argparse.Namespace:
         help="Pretty-print the JSON output"
     )
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def split_list(value: str) -> List[str]:
+    """
+    Split a comma-separated command-line value into its non-empty items.
+    
+    Args:
+        value (str): The comma-separated value
+    
+    Returns:
+        List[str]: The stripped items, without empty entries
+    """
+    if not value:
+        return []
+    return [item for item in _LIST_SEPARATOR.split(value.strip()) if item]
 
 
 def create_learner_profile(args: argparse.Namespace) -> Dict[str, Any]:
@@ -91,8 +186,8 @@ def create_learner_profile(args: argparse.Namespace) -> Dict[str, Any]:
         "age": args.age,
         "grade_level": args.grade_level,
         "learning_style": args.learning_style,
-        "known_topics": [t.strip() for t in args.known_topics.split(",")] if args.known_topics else [],
-        "struggles": [s.strip() for s in args.struggles.split(",")] if args.struggles else [],
+        "known_topics": split_list(args.known_topics),
+        "struggles": split_list(args.struggles),
         "goal": args.goal
     }
 
@@ -111,19 +206,17 @@ def main() -> None:
     learner_data = create_learner_profile(args)
     
     try:
-        # Generate learning plan
-        learning_plan = generate_learning_plan(learner_data)
-        
-        # Format the output
-        indent = 2 if args.pretty else None
-        output = json.dumps(learning_plan, indent=indent)
+        # Generate the learning plan as JSON
+        output = generate_learning_plan_json(learner_data, pretty=args.pretty)
         
-        # Write to file or stdout
+        # Write the bytes to file or stdout without decoding them again
         if args.output:
-            with open(args.output, "w") as f:
+            with open(args.output, "wb", buffering=_OUTPUT_BUFFER_SIZE) as f:
                 f.write(output)
         else:
-            print(output)
+            sys.stdout.buffer.write(output)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
             
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
@@ -11,6 +11,11 @@ import argparse
 import logging
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
+
 from seek_core import generate_learning_plan
 from seek_core.config import get_default_config
 
@@ -35,7 +40,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--model",
         type=str,
-        help="OpenAI model to use (default: uses environment variable or gpt-4)",
+        help="OpenAI model to use (default: uses environment variable or gpt-4o-mini)",
         default=None
     )
     parser.add_argument(
@@ -78,8 +83,12 @@ def save_to_file(data: Dict[str, Any], filename: str) -> None:
         filename (str): The file to save to
     """
     try:
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            output = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            output = json.dumps(data, indent=2).encode("utf-8")
+        with open(filename, "wb") as f:
+            f.write(output)
         logger.info(f"Learning plan saved to {filename}")
     except Exception as e:
         logger.error(f"Error saving to file {filename}: {str(e)}")
@@ -7,35 +7,46 @@ This script runs formatters to automatically fix most linting issues:
 2. isort to fix import sorting
 3. A custom script to fix newlines at end of files and trailing whitespace
 """
+import importlib.util
 import os
 import re
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+_TRAILING_WS = re.compile(rb"[ \t]+(?=\r?$)", re.MULTILINE)
+
 
 def fix_newlines_and_whitespace(file_path):
     """Fix newlines at end of files and trailing whitespace."""
-    with open(file_path, "r") as f:
+    with open(file_path, "rb") as f:
         content = f.read()
     
-    # Fix trailing whitespace
-    content = re.sub(r"[ \t]+$", "", content, flags=re.MULTILINE)
-    
-    # Ensure exactly one newline at the end of file
-    content = content.rstrip("\n") + "\n"
+    # Fix trailing whitespace and ensure exactly one newline at the end of file
+    fixed = _TRAILING_WS.sub(b"", content).rstrip(b"\n") + b"\n"
     
-    with open(file_path, "w") as f:
-        f.write(content)
+    # Leave already-clean files (and their mtimes) untouched
+    if fixed != content:
+        with open(file_path, "wb") as f:
+            f.write(fixed)
+
+
+def _scan_python_files(directory):
+    """Yield the paths of Python files below a directory."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_python_files(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
 
 
 def get_python_files(root_dirs):
     """Get all Python files in the given directories."""
     python_files = []
     for root_dir in root_dirs:
-        for root, _, files in os.walk(root_dir):
-            for file in files:
-                if file.endswith(".py"):
-                    python_files.append(os.path.join(root, file))
+        python_files.extend(_scan_python_files(root_dir))
     return python_files
 
 
@@ -45,6 +56,14 @@ def fix_unused_imports(file_path):
     print(f"Warning: You might need to manually fix unused imports in {file_path}")
 
 
+def run_tool(module, *args):
+    """Run a formatter module with the current interpreter, without a shell."""
+    result = subprocess.run([sys.executable, "-m", module, *args])
+    if result.returncode != 0:
+        print(f"Warning: {module} exited with status {result.returncode}")
+    return result.returncode
+
+
 def main():
     """Run fixers on all Python files."""
     root_dirs = ["seek_core", "tests"]
@@ -52,27 +71,26 @@ def main():
     
     print(f"Found {len(python_files)} Python files to process")
     
-    # Fix newlines and whitespace
-    for file in python_files:
-        fix_newlines_and_whitespace(file)
+    # Fix newlines and whitespace; the work is I/O-bound so use threads
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(fix_newlines_and_whitespace, python_files))
     print("Fixed newlines and whitespace")
     
-    # Run black for formatting with increased line length
+    # Run black for formatting with increased line length. The formatters
+    # rewrite the same files, so they run one after the other.
     print("Running black formatter...")
-    os.system("black --line-length 160 seek_core tests")
+    run_tool("black", "--line-length", "160", *root_dirs)
     
     # Run isort for import sorting, configured to be black-compatible
     print("Running isort for import sorting...")
-    os.system("isort --profile black --line-length 160 seek_core tests")
+    run_tool("isort", "--profile", "black", "--line-length", "160", *root_dirs)
     
     # Remove unused imports if autoflake is available
-    try:
-        import importlib
-        importlib.import_module('autoflake')
+    if importlib.util.find_spec("autoflake") is not None:
         print("Running autoflake to remove unused imports...")
-        os.system("autoflake --in-place --remove-all-unused-imports --recursive seek_core tests")
+        run_tool("autoflake", "--in-place", "--remove-all-unused-imports", "--recursive", *root_dirs)
         print("Autoflake completed")
-    except ImportError:
+    else:
         print("Autoflake not available - skipping unused import removal")
     
     print("\nAutomatic fixes applied. Some issues might require manual fixes:")
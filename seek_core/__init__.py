@@ -5,7 +5,6 @@ This package provides functionality for generating personalized learning plans
 based on learner profiles.
 """
 
-from .__main__ import generate_learning_plan
 from .models.schemas import (
     LearnerProfile,
     LearningPlanResponse,
@@ -19,4 +18,18 @@ __all__ = [
     "MicroLesson",
     "QuizQuestion",
     "generate_learning_plan",
+    "generate_learning_plan_json",
 ]
+
+# The entry points pull in the services and the OpenAI SDK, so they are only
+# imported on first access (PEP 562) to keep `import seek_core` cheap for
+# callers that just need the models.
+_LAZY_EXPORTS = {"generate_learning_plan", "generate_learning_plan_json"}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from . import __main__
+
+        return getattr(__main__, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
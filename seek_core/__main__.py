@@ -5,11 +5,63 @@ This module provides convenient access to the core functionality
 of the seek_core package.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-from .models.schemas import LearnerProfile
+from .models.schemas import LearnerProfile, LearningPlanResponse
 from .services.learning_plan_service import LearningPlanService
 
+# Services are reused across calls so the underlying OpenAI client keeps its
+# HTTP connection pool alive instead of redoing the TLS handshake every time.
+_SERVICE_CACHE: Dict[Tuple[Optional[str], Optional[str]], LearningPlanService] = {}
+
+
+def _get_service(
+    api_key: Optional[str] = None, model: Optional[str] = None
+) -> LearningPlanService:
+    """
+    Get a cached learning plan service for the given API key and model.
+
+    Args:
+        api_key (Optional[str]): OpenAI API key. If None, will look in env vars.
+        model (Optional[str]): OpenAI model to use. If None, will use default config.
+
+    Returns:
+        LearningPlanService: A service instance shared by all callers with the same key
+    """
+    key = (api_key, model)
+    service = _SERVICE_CACHE.get(key)
+    if service is None:
+        service = _SERVICE_CACHE.setdefault(
+            key, LearningPlanService(api_key=api_key, model=model)
+        )
+    return service
+
+
+def _generate(
+    learner_data: Dict[str, Any],
+    api_key: Optional[str] = None,
+    model: Optional[str] = None,
+) -> LearningPlanResponse:
+    """
+    Validate learner data and generate a learning plan model for it.
+
+    Args:
+        learner_data (Dict[str, Any]): Dictionary containing learner profile data
+        api_key (Optional[str]): OpenAI API key. If None, will look in env vars.
+        model (Optional[str]): OpenAI model to use. If None, will use default config.
+
+    Returns:
+        LearningPlanResponse: The generated learning plan
+    """
+    # Convert the dictionary to a LearnerProfile object
+    learner = LearnerProfile.model_validate(learner_data)
+
+    # Reuse the learning plan service for this API key and model
+    service = _get_service(api_key=api_key, model=model)
+
+    # Generate the learning plan
+    return service.generate_learning_plan(learner)
+
 
 def generate_learning_plan(
     learner_data: Dict[str, Any],
@@ -19,7 +71,8 @@ def generate_learning_plan(
     """
     Generate a learning plan from learner data.
 
-    This is the main entry point for the seek_core package.
+    This is the main entry point for the seek_core package. The roadmap, quiz,
+    and explanation are generated concurrently.
 
     Args:
         learner_data (Dict[str, Any]): Dictionary containing learner profile data
@@ -60,14 +113,33 @@ def generate_learning_plan(
         ...     print(f"Question {i}: {question['question']}")
         ...     print(f"  Answer: {question['options'][question['correct_answer_index']]}")
     """
-    # Convert the dictionary to a LearnerProfile object
-    learner = LearnerProfile(**learner_data)
+    learning_plan = _generate(learner_data, api_key=api_key, model=model)
 
-    # Initialize the learning plan service with provided API key and model
-    service = LearningPlanService(api_key=api_key, model=model)
+    # Convert the learning plan to a dictionary
+    return learning_plan.model_dump(mode="python")
 
-    # Generate the learning plan
-    learning_plan = service.generate_learning_plan(learner)
 
-    # Convert the learning plan to a dictionary
-    return learning_plan.model_dump()
+def generate_learning_plan_json(
+    learner_data: Dict[str, Any],
+    api_key: Optional[str] = None,
+    model: Optional[str] = None,
+    pretty: bool = False,
+) -> bytes:
+    """
+    Generate a learning plan from learner data as UTF-8 encoded JSON.
+
+    Use this instead of generate_learning_plan when the plan is only going to
+    be written out as JSON: Pydantic serializes the model directly, without
+    building an intermediate dictionary.
+
+    Args:
+        learner_data (Dict[str, Any]): Dictionary containing learner profile data
+        api_key (Optional[str]): OpenAI API key. If None, will look in env vars.
+        model (Optional[str]): OpenAI model to use. If None, will use default config.
+        pretty (bool): Whether to indent the JSON output by two spaces
+
+    Returns:
+        bytes: The generated learning plan as a JSON document
+    """
+    learning_plan = _generate(learner_data, api_key=api_key, model=model)
+    return learning_plan.model_dump_json(indent=2 if pretty else None).encode("utf-8")
@@ -5,21 +5,28 @@ This module provides configuration settings for the seek_core package,
 including loading environment variables and providing default settings.
 """
 
+import functools
 import logging
 import os
 from typing import Any, Dict
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Set up logging, unless the host application already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
 logger = logging.getLogger("seek_core")
 
 
+@functools.lru_cache(maxsize=None)
 def get_openai_api_key() -> str:
     """
     Get the OpenAI API key from environment variables.
 
+    The key is looked up once per process; a missing key is not cached, so a
+    later call succeeds once OPENAI_API_KEY has been set.
+
     Returns:
         str: The OpenAI API key
 
@@ -34,25 +41,42 @@ def get_openai_api_key() -> str:
     return api_key
 
 
+@functools.lru_cache(maxsize=1)
 def get_default_config() -> Dict[str, Any]:
     """
     Get the default configuration for the seek_core package.
 
+    The environment is read once and the same dictionary is returned on every
+    call, so callers must treat it as read-only (copy it to customize).
+    Call get_default_config.cache_clear() to pick up changed variables.
+
     Returns:
         Dict[str, Any]: The default configuration
     """
     return {
-        "openai_model": os.environ.get("OPENAI_MODEL", "gpt-4"),
+        "openai_model": os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
+        "quiz_model": os.environ.get("QUIZ_MODEL", "gpt-4o-mini"),
+        "embedding_model": os.environ.get(
+            "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
+        ),
         "temperature": float(os.environ.get("OPENAI_TEMPERATURE", "0.7")),
-        "max_tokens": int(os.environ.get("OPENAI_MAX_TOKENS", "2000")),
+        "max_tokens": int(os.environ.get("OPENAI_MAX_TOKENS", "1200")),
+        "roadmap_max_tokens": int(os.environ.get("ROADMAP_MAX_TOKENS", "2200")),
+        "quiz_max_tokens": int(os.environ.get("QUIZ_MAX_TOKENS", "1500")),
+        "max_retries": int(os.environ.get("OPENAI_MAX_RETRIES", "4")),
+        "request_timeout": float(os.environ.get("OPENAI_TIMEOUT", "60")),
         "min_lessons": int(os.environ.get("MIN_LESSONS", "3")),
         "max_lessons": int(os.environ.get("MAX_LESSONS", "5")),
         "min_quiz_questions": int(os.environ.get("MIN_QUIZ_QUESTIONS", "3")),
         "max_quiz_questions": int(os.environ.get("MAX_QUIZ_QUESTIONS", "5")),
+        "plan_concurrency": int(os.environ.get("PLAN_CONCURRENCY", "8")),
+        "response_cache_size": int(os.environ.get("RESPONSE_CACHE_SIZE", "1024")),
+        "plan_cache_enabled": os.environ.get("PLAN_CACHE_ENABLED", "false").lower()
+        in ("1", "true", "yes"),
+        "plan_cache_threshold": float(os.environ.get("PLAN_CACHE_THRESHOLD", "0.92")),
         "log_level": os.environ.get("LOG_LEVEL", "INFO"),
     }
 
 
 # Set the log level from configuration
-log_level = os.environ.get("LOG_LEVEL", "INFO")
-logger.setLevel(getattr(logging, log_level))
+logger.setLevel(getattr(logging, get_default_config()["log_level"]))
@@ -4,6 +4,7 @@ LLM module for the seek_core package.
 This module provides services for interacting with language models.
 """
 
+from .cache import ResponseCache, SemanticCache
 from .openai_service import LLMService
 
-__all__ = ["LLMService"]
+__all__ = ["LLMService", "ResponseCache", "SemanticCache"]
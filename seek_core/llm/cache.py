@@ -0,0 +1,191 @@
+"""
+Response caches for the seek-core LLM integration.
+
+This module provides an exact-match cache and an embedding-based semantic
+cache so that repeated or near-duplicate prompts can skip the OpenAI API.
+"""
+
+import hashlib
+import math
+import shelve
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+class ResponseCache:
+    """
+    Exact-match cache for generated responses.
+
+    Entries are kept in memory in least-recently-used order. When a path is
+    given, entries are also persisted with shelve so they survive restarts.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        """
+        Initialize the response cache.
+
+        Args:
+            maxsize (int): Maximum number of in-memory entries. 0 disables the cache.
+            path (Optional[str]): Optional shelve file used to persist entries.
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = shelve.open(path) if path else None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from the parts that determine a response.
+
+        Args:
+            *parts (Any): Values such as the model, prompts and temperature
+
+        Returns:
+            str: A SHA-256 hex digest identifying the combination of parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Optional[Any]: The cached response, or None on a miss
+        """
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            if self._store is not None and key in self._store:
+                value = self._store[key]
+                self._remember(key, value)
+                return value
+
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            key (str): The cache key
+            value (Any): The response to cache
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._remember(key, value)
+            if self._store is not None:
+                self._store[key] = value
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            if self._store is not None:
+                self._store.clear()
+
+    def close(self) -> None:
+        """Close the backing shelve file, if any."""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for generated responses.
+
+    Entries are grouped by namespace (e.g. model and system prompt) and a
+    lookup returns the most similar entry whose cosine similarity with the
+    query embedding is at least the configured threshold.
+    """
+
+    def __init__(self, threshold: float = 0.97, maxsize: int = 256):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold (float): Minimum cosine similarity for a cache hit
+            maxsize (int): Maximum number of entries kept per namespace
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, List[Tuple[List[float], Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: Hashable, embedding: Sequence[float]) -> Optional[Any]:
+        """
+        Look up the closest cached response for an embedding.
+
+        Args:
+            namespace (Hashable): The group of entries to search
+            embedding (Sequence[float]): The query embedding
+
+        Returns:
+            Optional[Any]: The most similar cached response, or None on a miss
+        """
+        query = _normalize(embedding)
+        best_score = self.threshold
+        best_value = None
+
+        with self._lock:
+            for vector, value in self._entries.get(namespace, ()):
+                score = sum(a * b for a, b in zip(query, vector))
+                if score >= best_score:
+                    best_score = score
+                    best_value = value
+
+        return best_value
+
+    def set(self, namespace: Hashable, embedding: Sequence[float], value: Any) -> None:
+        """
+        Store a response with its embedding.
+
+        Args:
+            namespace (Hashable): The group of entries to add to
+            embedding (Sequence[float]): The embedding of the prompt
+            value (Any): The response to cache
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            entries = self._entries.setdefault(namespace, [])
+            entries.append((_normalize(embedding), value))
+            if len(entries) > self.maxsize:
+                del entries[0]
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
@@ -0,0 +1,66 @@
+"""
+Incremental decoding of streamed JSON responses.
+
+This module lets callers act on the elements of a JSON array while the rest
+of the response is still being generated.
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[\s,]*")
+
+
+def iter_array_items(chunks: Iterable[str], key: str) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level array as soon as each one is complete.
+
+    Only the array stored under key is decoded; the rest of the document is
+    skipped. The elements are expected to be objects (or strings), whose end
+    can be recognized without looking ahead.
+
+    Args:
+        chunks (Iterable[str]): Successive pieces of the JSON document
+        key (str): The name of the array in the top-level object
+
+    Yields:
+        Any: Each decoded element of the array, in order
+
+    Raises:
+        ValueError: If the document ends before the array is closed
+    """
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ""
+    in_array = False
+
+    for chunk in chunks:
+        buffer += chunk
+
+        if not in_array:
+            match = start.search(buffer)
+            if match is None:
+                continue
+            buffer = buffer[match.end() :]
+            in_array = True
+
+        while True:
+            pos = _WHITESPACE.match(buffer).end()
+            if pos == len(buffer):
+                buffer = ""
+                break
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = _DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element is still incomplete; wait for more of the stream
+                buffer = buffer[pos:]
+                break
+
+            buffer = buffer[end:]
+            yield item
+
+    raise ValueError(f'Response ended before the "{key}" array was complete')
@@ -5,15 +5,47 @@ This module manages communication with OpenAI's API for generating
 learning content based on learner profiles.
 """
 
+import importlib.util
+import json
 import logging
-from typing import Any, Dict, Optional
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    _json_loads = json.loads
 
 from seek_core.config import get_default_config, get_openai_api_key
 
+from .cache import ResponseCache, SemanticCache
+
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by the requests of one LLMService. HTTP/2 lets the
+# concurrent roadmap, quiz and explanation calls share a single connection; it
+# needs the optional h2 package (pip install "httpx[http2]").
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+
+# Plain JSON mode (response_format={"type": "json_object"}) enforces valid JSON
+# server-side, but the API still requires "JSON" to appear in the messages.
+_DEFAULT_JSON_SYSTEM_PROMPT = "You generate educational content as JSON."
+
 
 class LLMService:
     """
@@ -23,13 +55,21 @@ class LLMService:
     all LLM-related functionality within seek-core.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+    ):
         """
         Initialize the LLM service with API key and model configuration.
 
         Args:
             api_key (Optional[str]): The OpenAI API key. If None, will look for OPENAI_API_KEY env var.
             model (Optional[str]): The OpenAI model to use. If None, will use the configured default.
+            cache (Optional[ResponseCache]): Exact-match cache for responses. If None, responses aren't cached.
+            semantic_cache (Optional[SemanticCache]): Embedding-similarity cache consulted after an exact miss.
         """
         # Get configuration
         config = get_default_config()
@@ -39,12 +79,142 @@ class LLMService:
 
         # Set model
         self.model = model or config["openai_model"]
+        self.embedding_model = config["embedding_model"]
+        self.max_tokens = config["max_tokens"]
+
+        # Set response caches
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+
+        # Transient 429/5xx errors are retried by the SDK with exponential
+        # backoff, reusing the same keep-alive connections
+        self.max_retries = config["max_retries"]
+        self.timeout = httpx.Timeout(config["request_timeout"], connect=5.0)
+
+        # Initialize client with an explicit keep-alive connection pool
+        self._http = httpx.Client(
+            http2=_HTTP2, limits=_HTTP_LIMITS, timeout=self.timeout
+        )
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=self._http,
+            max_retries=self.max_retries,
+            timeout=self.timeout,
+        )
+        self._async_client: Optional[AsyncOpenAI] = None
 
-        # Initialize client
-        self.client = OpenAI(api_key=self.api_key)
+    @classmethod
+    def shared(
+        cls, api_key: Optional[str] = None, model: Optional[str] = None
+    ) -> "LLMService":
+        """
+        Get the process-wide LLM service for an API key and model.
+
+        Services that share an instance also share its connection pool and
+        caches, so keep-alive connections are reused instead of each service
+        paying for its own TLS handshakes. Shared instances are owned by this
+        registry and live for the rest of the process: their users must not
+        call close() on them or use them as context managers. The one
+        exception is aclose(), which each caller that runs a shared instance
+        under its own event loop should call before that loop exits.
+
+        Args:
+            api_key (Optional[str]): The OpenAI API key. If None, will look for OPENAI_API_KEY env var.
+            model (Optional[str]): The OpenAI model to use. If None, will use the configured default.
+
+        Returns:
+            LLMService: The shared service for this API key and model
+        """
+        key = (api_key, model)
+        with _SHARED_LOCK:
+            service = _SHARED.get(key)
+            if service is None:
+                service = _SHARED[key] = cls(api_key=api_key, model=model)
+        return service
+
+    def __enter__(self) -> "LLMService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the synchronous client and its connection pool.
+
+        Only the owner of an instance created directly should close it;
+        instances returned by shared() are never closed.
+        """
+        self.client.close()
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Get the asynchronous OpenAI client, creating it on first use.
+
+        Returns:
+            AsyncOpenAI: The asynchronous client
+        """
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(
+                    http2=_HTTP2, limits=_HTTP_LIMITS, timeout=self.timeout
+                ),
+                max_retries=self.max_retries,
+                timeout=self.timeout,
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """
+        Close the asynchronous client.
+
+        The async client's connections belong to the event loop they were opened
+        on, so whoever runs that loop (e.g. with asyncio.run()) owns closing them
+        and should call this before the loop exits. This is also the case for
+        shared() instances: only the async client is closed, the synchronous
+        client and caches are left untouched, and a new async client is created
+        on next use.
+        """
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Compute an embedding for a piece of text using the OpenAI API.
+
+        Args:
+            text (str): The text to embed
+
+        Returns:
+            List[float]: The embedding vector
+        """
+        response = self.client.embeddings.create(model=self.embedding_model, input=text)
+        return response.data[0].embedding
+
+    async def aembed(self, text: str) -> List[float]:
+        """
+        Asynchronously compute an embedding for a piece of text.
+
+        Args:
+            text (str): The text to embed
+
+        Returns:
+            List[float]: The embedding vector
+        """
+        response = await self.async_client.embeddings.create(
+            model=self.embedding_model, input=text
+        )
+        return response.data[0].embedding
 
     def generate_content(
-        self, prompt: str, system_prompt: str = None, temperature: float = 0.7
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.7,
+        semantic_context: Optional[Tuple[Hashable, str]] = None,
     ) -> str:
         """
         Generate content using the OpenAI API.
@@ -54,6 +224,60 @@ class LLMService:
             system_prompt (str, optional): System prompt to guide the model behavior
             temperature (float): Controls randomness. Higher values mean more randomness.
                                 Default is 0.7.
+            semantic_context (Optional[Tuple[Hashable, str]]): The parts of the request
+                that must match exactly for a semantic cache hit, and the text whose
+                wording may vary. If None, the whole prompt is embedded.
+
+        Returns:
+            str: The generated content
+
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            messages = self._build_messages(prompt, system_prompt)
+
+            key = ResponseCache.make_key(self.model, system_prompt, prompt, temperature)
+            namespace, text = self._semantic_key(
+                (self.model, system_prompt, temperature), prompt, semantic_context
+            )
+            content, embedding = self._get_cached(key, namespace, text)
+            if content is not None:
+                return content
+
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=self.max_tokens,
+            )
+
+            content = response.choices[0].message.content
+            self._set_cached(key, namespace, embedding, content)
+            return content
+
+        except Exception as e:
+            logger.error("Error generating content: %s", e)
+            raise
+
+    async def agenerate_content(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = 0.7,
+        semantic_context: Optional[Tuple[Hashable, str]] = None,
+    ) -> str:
+        """
+        Asynchronously generate content using the OpenAI API.
+
+        Args:
+            prompt (str): The prompt to send to the model
+            system_prompt (str, optional): System prompt to guide the model behavior
+            temperature (float): Controls randomness. Higher values mean more randomness.
+                                Default is 0.7.
+            semantic_context (Optional[Tuple[Hashable, str]]): The parts of the request
+                that must match exactly for a semantic cache hit, and the text whose
+                wording may vary. If None, the whole prompt is embedded.
 
         Returns:
             str: The generated content
@@ -62,31 +286,256 @@ class LLMService:
             Exception: If API call fails
         """
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
+            messages = self._build_messages(prompt, system_prompt)
 
-            messages.append({"role": "user", "content": prompt})
+            key = ResponseCache.make_key(self.model, system_prompt, prompt, temperature)
+            namespace, text = self._semantic_key(
+                (self.model, system_prompt, temperature), prompt, semantic_context
+            )
+            content, embedding = await self._aget_cached(key, namespace, text)
+            if content is not None:
+                return content
 
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=self.max_tokens,
+            )
+
+            content = response.choices[0].message.content
+            self._set_cached(key, namespace, embedding, content)
+            return content
+
+        except Exception as e:
+            logger.error("Error generating content: %s", e)
+            raise
+
+    def stream_content(
+        self, prompt: str, system_prompt: str = None, temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Generate content using the OpenAI API, yielding it as it is produced.
+
+        Only the exact-match cache is consulted, since a semantic lookup would
+        need an embedding round trip before the first token.
+
+        Args:
+            prompt (str): The prompt to send to the model
+            system_prompt (str, optional): System prompt to guide the model behavior
+            temperature (float): Controls randomness. Higher values mean more randomness.
+                                Default is 0.7.
+
+        Yields:
+            str: Successive pieces of the generated content
+
+        Raises:
+            Exception: If API call fails
+        """
+        key = ResponseCache.make_key(self.model, system_prompt, prompt, temperature)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                yield content
+                return
+
+        response = None
+        parts = []
+        try:
             response = self.client.chat.completions.create(
-                model=self.model, messages=messages, temperature=temperature
+                model=self.model,
+                messages=self._build_messages(prompt, system_prompt),
+                temperature=temperature,
+                max_tokens=self.max_tokens,
+                stream=True,
             )
 
-            return response.choices[0].message.content
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
 
         except Exception as e:
-            logger.error(f"Error generating content: {str(e)}")
+            logger.error("Error streaming content: %s", e)
             raise
 
+        finally:
+            # Also runs when the consumer stops early, releasing the connection
+            if response is not None:
+                response.close()
+
+        if self.cache is not None:
+            self.cache.set(key, "".join(parts))
+
+    async def astream_content(
+        self, prompt: str, system_prompt: str = None, temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously generate content, yielding it as it is produced.
+
+        Args:
+            prompt (str): The prompt to send to the model
+            system_prompt (str, optional): System prompt to guide the model behavior
+            temperature (float): Controls randomness. Higher values mean more randomness.
+                                Default is 0.7.
+
+        Yields:
+            str: Successive pieces of the generated content
+
+        Raises:
+            Exception: If API call fails
+        """
+        key = ResponseCache.make_key(self.model, system_prompt, prompt, temperature)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                yield content
+                return
+
+        response = None
+        parts = []
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(prompt, system_prompt),
+                temperature=temperature,
+                max_tokens=self.max_tokens,
+                stream=True,
+            )
+
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+
+        except Exception as e:
+            logger.error("Error streaming content: %s", e)
+            raise
+
+        finally:
+            # Also runs when the consumer stops early, releasing the connection
+            if response is not None:
+                await response.close()
+
+        if self.cache is not None:
+            self.cache.set(key, "".join(parts))
+
+    def stream_json_content(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        schema: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Generate JSON-structured content, yielding the raw text as it is produced.
+
+        The pieces can be decoded incrementally with json_stream.iter_array_items.
+        Responses are shared with generate_json_content through the exact-match
+        cache.
+
+        Args:
+            prompt (str): The prompt to send to the model
+            system_prompt (str, optional): System prompt to guide the model behavior
+            schema (Optional[Dict[str, Any]]): JSON schema the response must follow. If
+                None, any JSON object is accepted.
+            max_tokens (Optional[int]): Completion token limit for this response. If
+                None, the configured max_tokens is used.
+            model (Optional[str]): Model to use for this response. If None, the
+                service's model is used.
+
+        Yields:
+            str: Successive pieces of the generated JSON text
+
+        Raises:
+            Exception: If API call fails
+        """
+        if system_prompt is None:
+            system_prompt = _DEFAULT_JSON_SYSTEM_PROMPT
+
+        model = model or self.model
+        response_format = self._response_format(schema)
+        format_name = response_format.get("json_schema", {}).get("name", "json")
+        key = ResponseCache.make_key(model, system_prompt, prompt, format_name)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                yield content
+                return
+
+        response = None
+        parts = []
+        refused = False
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=self._build_messages(prompt, system_prompt),
+                response_format=response_format,
+                temperature=0.7,
+                max_tokens=max_tokens or self.max_tokens,
+                stream=True,
+            )
+
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                refused = refused or bool(delta.refusal)
+                if delta.content:
+                    parts.append(delta.content)
+                    yield parts[-1]
+
+        except Exception as e:
+            logger.error("Error streaming JSON content: %s", e)
+            raise
+
+        finally:
+            # Also runs when the consumer stops early, releasing the connection
+            if response is not None:
+                response.close()
+
+        # generate_json_content reads the same entry, so only complete,
+        # decodable responses are cached
+        if self.cache is None or refused:
+            return
+
+        content = "".join(parts)
+        try:
+            _json_loads(content)
+        except ValueError:
+            logger.warning("Streamed JSON content is incomplete; not caching it")
+            return
+
+        self.cache.set(key, content)
+
     def generate_json_content(
-        self, prompt: str, system_prompt: str = None
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        schema: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        semantic_context: Optional[Tuple[Hashable, str]] = None,
     ) -> Dict[str, Any]:
         """
         Generate JSON-structured content using the OpenAI API.
 
+        The completion is streamed so the response body is received while the
+        model is still generating, and decoded once the stream closes.
+
         Args:
             prompt (str): The prompt to send to the model
             system_prompt (str, optional): System prompt to guide the model behavior
+            schema (Optional[Dict[str, Any]]): JSON schema the response must follow. If
+                None, any JSON object is accepted.
+            max_tokens (Optional[int]): Completion token limit for this response. If
+                None, the configured max_tokens is used.
+            model (Optional[str]): Model to use for this response. If None, the
+                service's model is used.
+            semantic_context (Optional[Tuple[Hashable, str]]): The parts of the request
+                that must match exactly for a semantic cache hit, and the text whose
+                wording may vary. If None, the whole prompt is embedded.
 
         Returns:
             Dict[str, Any]: The generated content as a Python dictionary
@@ -96,22 +545,273 @@ class LLMService:
         """
         try:
             if system_prompt is None:
-                system_prompt = "You are an AI assistant that generates educational content. Always respond with valid JSON."
+                system_prompt = _DEFAULT_JSON_SYSTEM_PROMPT
 
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ]
+            messages = self._build_messages(prompt, system_prompt)
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                response_format={"type": "json_object"},
-                temperature=0.7,
+            model = model or self.model
+            response_format = self._response_format(schema)
+            format_name = response_format.get("json_schema", {}).get("name", "json")
+            key = ResponseCache.make_key(model, system_prompt, prompt, format_name)
+            namespace, text = self._semantic_key(
+                (model, system_prompt, format_name), prompt, semantic_context
             )
+            content, embedding = self._get_cached(key, namespace, text)
+            if content is None:
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    response_format=response_format,
+                    temperature=0.7,
+                    max_tokens=max_tokens or self.max_tokens,
+                    stream=True,
+                )
+
+                parts = []
+                for chunk in response:
+                    if chunk.choices:
+                        parts.append(chunk.choices[0].delta.content or "")
+                content = "".join(parts)
 
-            return response.choices[0].message.content
+                data = _json_loads(content)
+                self._set_cached(key, namespace, embedding, content)
+                return data
+
+            return _json_loads(content)
 
         except Exception as e:
-            logger.error(f"Error generating JSON content: {str(e)}")
+            logger.error("Error generating JSON content: %s", e)
             raise
+
+    async def agenerate_json_content(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        schema: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        semantic_context: Optional[Tuple[Hashable, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate JSON-structured content using the OpenAI API.
+
+        Args:
+            prompt (str): The prompt to send to the model
+            system_prompt (str, optional): System prompt to guide the model behavior
+            schema (Optional[Dict[str, Any]]): JSON schema the response must follow. If
+                None, any JSON object is accepted.
+            max_tokens (Optional[int]): Completion token limit for this response. If
+                None, the configured max_tokens is used.
+            model (Optional[str]): Model to use for this response. If None, the
+                service's model is used.
+            semantic_context (Optional[Tuple[Hashable, str]]): The parts of the request
+                that must match exactly for a semantic cache hit, and the text whose
+                wording may vary. If None, the whole prompt is embedded.
+
+        Returns:
+            Dict[str, Any]: The generated content as a Python dictionary
+
+        Raises:
+            Exception: If API call fails or response isn't valid JSON
+        """
+        try:
+            if system_prompt is None:
+                system_prompt = _DEFAULT_JSON_SYSTEM_PROMPT
+
+            messages = self._build_messages(prompt, system_prompt)
+
+            model = model or self.model
+            response_format = self._response_format(schema)
+            format_name = response_format.get("json_schema", {}).get("name", "json")
+            key = ResponseCache.make_key(model, system_prompt, prompt, format_name)
+            namespace, text = self._semantic_key(
+                (model, system_prompt, format_name), prompt, semantic_context
+            )
+            content, embedding = await self._aget_cached(key, namespace, text)
+            if content is None:
+                response = await self.async_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    response_format=response_format,
+                    temperature=0.7,
+                    max_tokens=max_tokens or self.max_tokens,
+                    stream=True,
+                )
+
+                parts = []
+                async for chunk in response:
+                    if chunk.choices:
+                        parts.append(chunk.choices[0].delta.content or "")
+                content = "".join(parts)
+
+                data = _json_loads(content)
+                self._set_cached(key, namespace, embedding, content)
+                return data
+
+            return _json_loads(content)
+
+        except Exception as e:
+            logger.error("Error generating JSON content: %s", e)
+            raise
+
+    @staticmethod
+    def _response_format(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the response_format argument for a JSON completion.
+
+        Args:
+            schema (Optional[Dict[str, Any]]): JSON schema the response must follow
+
+        Returns:
+            Dict[str, Any]: A strict json_schema format for the schema, or plain
+                JSON mode if no schema is given
+        """
+        if schema is None:
+            return {"type": "json_object"}
+
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.get("title", "response"),
+                "schema": schema,
+                "strict": True,
+            },
+        }
+
+    @staticmethod
+    def _build_messages(
+        prompt: str, system_prompt: Optional[str]
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a prompt.
+
+        Args:
+            prompt (str): The user prompt
+            system_prompt (Optional[str]): The system prompt, if any
+
+        Returns:
+            List[Dict[str, str]]: The chat-completions messages
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    @staticmethod
+    def _semantic_key(
+        namespace: Tuple[Any, ...],
+        prompt: str,
+        semantic_context: Optional[Tuple[Hashable, str]],
+    ) -> Tuple[Tuple[Any, ...], str]:
+        """
+        Get the semantic cache namespace and the text to embed for a request.
+
+        Prompts sharing a long fixed instruction block embed almost identically
+        whatever their learner details, so callers can pass those details
+        separately: the exact parts join the namespace and only the rest is
+        embedded.
+
+        Args:
+            namespace (Tuple[Any, ...]): The model and format parts of the namespace
+            prompt (str): The prompt sent to the model
+            semantic_context (Optional[Tuple[Hashable, str]]): The exact and the
+                embedded parts of the request, or None to embed the whole prompt
+
+        Returns:
+            Tuple[Tuple[Any, ...], str]: The namespace and the text to embed
+        """
+        if semantic_context is None:
+            return namespace, prompt
+
+        exact, text = semantic_context
+        return namespace + (exact,), text
+
+    def _get_cached(
+        self, key: str, namespace: Tuple[Any, ...], text: str
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """
+        Look up a response in the exact-match cache, then the semantic cache.
+
+        Args:
+            key (str): The exact-match cache key
+            namespace (Tuple[Any, ...]): The semantic cache namespace
+            text (str): The text embedded for semantic lookups
+
+        Returns:
+            Tuple[Optional[str], Optional[List[float]]]: The cached response (or None)
+                and the text embedding, if one was computed
+        """
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                return content, None
+
+        if self.semantic_cache is None:
+            return None, None
+
+        try:
+            embedding = self.embed(text)
+        except Exception as e:
+            logger.warning("Error computing prompt embedding: %s", e)
+            return None, None
+
+        return self.semantic_cache.get(namespace, embedding), embedding
+
+    async def _aget_cached(
+        self, key: str, namespace: Tuple[Any, ...], text: str
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """
+        Asynchronously look up a response in the configured caches.
+
+        Args:
+            key (str): The exact-match cache key
+            namespace (Tuple[Any, ...]): The semantic cache namespace
+            text (str): The text embedded for semantic lookups
+
+        Returns:
+            Tuple[Optional[str], Optional[List[float]]]: The cached response (or None)
+                and the text embedding, if one was computed
+        """
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                return content, None
+
+        if self.semantic_cache is None:
+            return None, None
+
+        try:
+            embedding = await self.aembed(text)
+        except Exception as e:
+            logger.warning("Error computing prompt embedding: %s", e)
+            return None, None
+
+        return self.semantic_cache.get(namespace, embedding), embedding
+
+    def _set_cached(
+        self,
+        key: str,
+        namespace: Tuple[Any, ...],
+        embedding: Optional[List[float]],
+        content: str,
+    ) -> None:
+        """
+        Store a freshly generated response in the configured caches.
+
+        Args:
+            key (str): The exact-match cache key
+            namespace (Tuple[Any, ...]): The semantic cache namespace
+            embedding (Optional[List[float]]): The prompt embedding, if computed
+            content (str): The generated response
+        """
+        if self.cache is not None:
+            self.cache.set(key, content)
+        if self.semantic_cache is not None and embedding is not None:
+            self.semantic_cache.set(namespace, embedding, content)
+
+
+# Instances handed out by LLMService.shared(), keyed on (api_key, model)
+_SHARED: Dict[Tuple[Optional[str], Optional[str]], LLMService] = {}
+_SHARED_LOCK = threading.Lock()
@@ -4,9 +4,12 @@ Pydantic models for representing learner profiles and learning plan responses.
 These models define the structure of the data flowing through the seek-core system.
 """
 
-from typing import List, Optional
+import hashlib
+import json
+from functools import cached_property
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class LearnerProfile(BaseModel):
@@ -22,16 +25,120 @@ class LearnerProfile(BaseModel):
         goal (str): The learning goal the learner wants to achieve
     """
 
-    age: int = Field(..., description="Age of the learner")
-    grade_level: int = Field(..., description="Current grade level (K-12)")
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
+    age: int = Field(..., ge=3, le=120, description="Age of the learner")
+    grade_level: int = Field(..., ge=0, le=12, description="Current grade level (K-12)")
     learning_style: str = Field(..., description="Learning style preference")
     known_topics: List[str] = Field(
-        default_factory=list, description="Topics the learner already understands"
+        default_factory=list,
+        max_length=50,
+        description="Topics the learner already understands",
     )
     struggles: List[str] = Field(
-        default_factory=list, description="Topics the learner finds challenging"
+        default_factory=list,
+        max_length=50,
+        description="Topics the learner finds challenging",
     )
-    goal: str = Field(..., description="Learning goal to achieve")
+    goal: str = Field(..., max_length=500, description="Learning goal to achieve")
+
+    @field_validator("known_topics", "struggles")
+    @classmethod
+    def normalize_topics(cls, topics: List[str]) -> List[str]:
+        """
+        Strip, lowercase, and de-duplicate topics, keeping their original order.
+
+        Args:
+            topics (List[str]): The topics as provided
+
+        Returns:
+            List[str]: The normalized topics with empty entries removed
+        """
+        normalized = (topic.strip().lower() for topic in topics)
+        return list(dict.fromkeys(topic for topic in normalized if topic))
+
+    @cached_property
+    def learning_style_key(self) -> str:
+        """
+        The learning style in lowercase, for comparisons.
+
+        Returns:
+            str: The lowercased learning style
+        """
+        return self.learning_style.lower()
+
+    @cached_property
+    def known_topics_csv(self) -> str:
+        """
+        The known topics, sorted and joined for use in prompts.
+
+        Returns:
+            str: A comma-separated list of the topics the learner knows
+        """
+        return ", ".join(sorted(self.known_topics))
+
+    @cached_property
+    def struggles_csv(self) -> str:
+        """
+        The topics the learner struggles with, sorted and joined for use in prompts.
+
+        Returns:
+            str: A comma-separated list of the topics the learner struggles with
+        """
+        return ", ".join(sorted(self.struggles))
+
+    @cached_property
+    def json_payload(self) -> bytes:
+        """
+        The canonical JSON encoding of the profile, serialized once per instance.
+
+        Topic lists are sorted so that profiles differing only in topic order
+        share a payload.
+
+        Returns:
+            bytes: The profile as compact UTF-8 JSON
+        """
+        payload = {
+            "age": self.age,
+            "grade_level": self.grade_level,
+            "learning_style": self.learning_style,
+            "known_topics": sorted(self.known_topics),
+            "struggles": sorted(self.struggles),
+            "goal": self.goal,
+        }
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    @cached_property
+    def cache_key(self) -> str:
+        """
+        A stable digest of the profile, used to cache content generated for it.
+
+        Returns:
+            str: A 128-bit BLAKE2b hex digest of json_payload
+        """
+        return hashlib.blake2b(self.json_payload, digest_size=16).hexdigest()
+
+    def __hash__(self) -> int:
+        return hash(self.cache_key)
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "LearnerProfile":
+        """
+        Copy the profile, dropping values derived from the original fields.
+
+        Args:
+            update (Optional[Dict[str, Any]]): Field values to change in the copy
+            deep (bool): Whether to make a deep copy
+
+        Returns:
+            LearnerProfile: The copied profile
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        for name, attribute in vars(type(self)).items():
+            if isinstance(attribute, cached_property):
+                copied.__dict__.pop(name, None)
+        return copied
 
 
 class MicroLesson(BaseModel):
@@ -45,6 +152,10 @@ class MicroLesson(BaseModel):
         content (str): The actual content of the micro-lesson
     """
 
+    # Unknown keys are rejected, which also lets the JSON schema of the model be
+    # used for strict structured outputs
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True, extra="forbid")
+
     title: str
     description: str
     estimated_time_minutes: int
@@ -62,6 +173,10 @@ class QuizQuestion(BaseModel):
         explanation (str): An explanation of why the correct answer is correct
     """
 
+    # Unknown keys are rejected, which also lets the JSON schema of the model be
+    # used for strict structured outputs
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True, extra="forbid")
+
     question: str
     options: List[str]
     correct_answer_index: int
@@ -79,6 +194,8 @@ class LearningPlanResponse(BaseModel):
         resource_link (Optional[str]): Optional link to additional learning resources
     """
 
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     roadmap: List[MicroLesson] = Field(..., description="Sequence of micro-lessons")
     quiz: List[QuizQuestion] = Field(..., description="Multiple-choice quiz questions")
     personalized_explanation: str = Field(
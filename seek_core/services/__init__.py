@@ -2,12 +2,19 @@
 Services module for the seek_core package.
 
 This module provides services for generating learning roadmaps, quizzes,
-and personalized explanations.
+curricula combining the two, and personalized explanations.
 """
 
+from .curriculum_service import CurriculumService
 from .explanation_service import ExplanationService
 from .learning_plan_service import LearningPlanService
 from .quiz_service import QuizService
 from .roadmap_service import RoadmapService
 
-__all__ = ["RoadmapService", "QuizService", "ExplanationService", "LearningPlanService"]
+__all__ = [
+    "RoadmapService",
+    "QuizService",
+    "CurriculumService",
+    "ExplanationService",
+    "LearningPlanService",
+]
@@ -0,0 +1,230 @@
+"""
+Service for generating a roadmap and a quiz together based on learner profiles.
+
+This module asks the LLM for both artifacts in a single request, saving a
+network round-trip for callers that need the lessons and the questions.
+"""
+
+import logging
+import textwrap
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from ..config import get_default_config
+from ..llm.cache import ResponseCache
+from ..llm.openai_service import LLMService
+from ..models.schemas import LearnerProfile, MicroLesson, QuizQuestion
+from .prompts import (
+    STUDENT_INFORMATION_TEMPLATE,
+    semantic_context,
+    student_fields,
+)
+from .quiz_service import fallback_quiz, parse_quiz
+from .roadmap_service import fallback_roadmap, parse_roadmap
+
+logger = logging.getLogger(__name__)
+
+
+class _CurriculumPayload(BaseModel):
+    """The JSON object the model is asked to return."""
+
+    model_config = ConfigDict(extra="forbid", title="curriculum")
+
+    lessons: List[MicroLesson]
+    questions: List[QuizQuestion]
+
+
+# Structured-output schema, so the API only returns conforming lessons and questions
+_CURRICULUM_SCHEMA = _CurriculumPayload.model_json_schema()
+
+_CURRICULUM_SYSTEM_PROMPT: Final[str] = textwrap.dedent("""
+    You are an expert educational content creator specializing in personalized learning paths and assessments.
+    Your task is to create engaging, age-appropriate micro-lessons that match the student's learning style
+    and build toward their specific learning goal, followed by clear multiple-choice questions that assess
+    the student's understanding of those lessons.
+    """).strip()
+
+# Static instructions come first so they form a cacheable prompt prefix;
+# the student details are filled in at the end
+_CURRICULUM_PROMPT_TEMPLATE: Final[str] = textwrap.dedent("""\
+        Create a personalized learning roadmap of 3-5 micro-lessons and a quiz of 3-5 multiple-choice questions to help a student achieve their learning goal.
+
+        Each micro-lesson should include:
+        1. A clear, engaging title (at most 10 words)
+        2. A brief description of what will be learned (at most 15 words)
+        3. Estimated time to complete in minutes (between 5-15 minutes per lesson)
+        4. Content that teaches the concept in a way that's appropriate for the student's age and learning style (at most 120 words)
+
+        Each quiz question should include:
+        1. A clear question that tests understanding of the lessons, not just memorization (at most 30 words)
+        2. Four multiple-choice options (labeled A, B, C, D; at most 12 words each)
+        3. The correct answer index (0 for A, 1 for B, 2 for C, 3 for D)
+        4. A brief explanation of why the correct answer is right (at most 40 words)
+
+        The lessons should build upon each other and be sequenced logically; the questions should vary in difficulty.
+        Return the micro-lessons in order in the "lessons" array and the questions in the "questions" array of your response, as minified JSON with no whitespace between tokens.
+
+        """) + STUDENT_INFORMATION_TEMPLATE
+
+
+class CurriculumService:
+    """
+    Service for generating a roadmap and a quiz in one LLM request.
+
+    Responses are parsed with the same functions RoadmapService and QuizService
+    use, so the results match what the two services would produce separately.
+    The request always uses the LLM service's model rather than quiz_model,
+    since the smaller quiz model is not meant to write the lessons.
+    """
+
+    def __init__(
+        self, llm_service: LLMService, config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the curriculum service with an LLM service.
+
+        Args:
+            llm_service (LLMService): The LLM service to use for generation
+            config (Optional[Dict[str, Any]]): Configuration options
+        """
+        self.llm_service = llm_service
+        self.config = config or get_default_config()
+        self._cache = ResponseCache(
+            maxsize=self.config.get("response_cache_size", 1024)
+        )
+
+    def generate_curriculum(
+        self, learner: LearnerProfile
+    ) -> Tuple[List[MicroLesson], List[QuizQuestion]]:
+        """
+        Generate a personalized roadmap and quiz for a learner.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            Tuple[List[MicroLesson], List[QuizQuestion]]: The roadmap and the quiz
+        """
+        logger.info("Generating curriculum for learner with goal: %s", learner.goal)
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return list(cached[0]), list(cached[1])
+
+        prompt, system_prompt = self._build_prompts(learner)
+
+        try:
+            # Generate the roadmap and quiz using the LLM
+            curriculum_data = self.llm_service.generate_json_content(
+                prompt,
+                system_prompt,
+                schema=_CURRICULUM_SCHEMA,
+                max_tokens=self._max_tokens(),
+                semantic_context=semantic_context(learner),
+            )
+            roadmap, quiz = self._parse_curriculum(curriculum_data)
+
+        except Exception as e:
+            logger.error("Error generating curriculum: %s", e)
+            return self._fallback_curriculum()
+
+        self._cache.set(learner.cache_key, (tuple(roadmap), tuple(quiz)))
+        return roadmap, quiz
+
+    async def agenerate_curriculum(
+        self, learner: LearnerProfile
+    ) -> Tuple[List[MicroLesson], List[QuizQuestion]]:
+        """
+        Asynchronously generate a personalized roadmap and quiz for a learner.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            Tuple[List[MicroLesson], List[QuizQuestion]]: The roadmap and the quiz
+        """
+        logger.info("Generating curriculum for learner with goal: %s", learner.goal)
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return list(cached[0]), list(cached[1])
+
+        prompt, system_prompt = self._build_prompts(learner)
+
+        try:
+            # Generate the roadmap and quiz using the LLM
+            curriculum_data = await self.llm_service.agenerate_json_content(
+                prompt,
+                system_prompt,
+                schema=_CURRICULUM_SCHEMA,
+                max_tokens=self._max_tokens(),
+                semantic_context=semantic_context(learner),
+            )
+            roadmap, quiz = self._parse_curriculum(curriculum_data)
+
+        except Exception as e:
+            logger.error("Error generating curriculum: %s", e)
+            return self._fallback_curriculum()
+
+        self._cache.set(learner.cache_key, (tuple(roadmap), tuple(quiz)))
+        return roadmap, quiz
+
+    def _build_prompts(self, learner: LearnerProfile) -> Tuple[str, str]:
+        """
+        Build the user and system prompts for a learner's curriculum.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            Tuple[str, str]: The user prompt and the system prompt
+        """
+        prompt = _CURRICULUM_PROMPT_TEMPLATE.format_map(student_fields(learner))
+
+        return prompt, _CURRICULUM_SYSTEM_PROMPT
+
+    def _max_tokens(self) -> Optional[int]:
+        """
+        Get the token budget for a response holding both artifacts.
+
+        The lessons and the questions are both written in the one response, so
+        it needs room for both budgets rather than the larger of the two.
+
+        Returns:
+            Optional[int]: The sum of the roadmap and quiz budgets, or None to
+            use the LLM service default
+        """
+        roadmap_max_tokens = self.config.get("roadmap_max_tokens")
+        quiz_max_tokens = self.config.get("quiz_max_tokens")
+        if roadmap_max_tokens is None or quiz_max_tokens is None:
+            return None
+
+        return roadmap_max_tokens + quiz_max_tokens
+
+    def _parse_curriculum(
+        self, curriculum_data: Dict[str, Any]
+    ) -> Tuple[List[MicroLesson], List[QuizQuestion]]:
+        """
+        Convert the LLM's JSON response into a roadmap and a quiz.
+
+        Args:
+            curriculum_data (Dict[str, Any]): The decoded JSON response
+
+        Returns:
+            Tuple[List[MicroLesson], List[QuizQuestion]]: The roadmap and the quiz
+        """
+        roadmap = parse_roadmap(curriculum_data, self.config)
+        quiz = parse_quiz(curriculum_data, self.config)
+
+        return roadmap, quiz
+
+    def _fallback_curriculum(self) -> Tuple[List[MicroLesson], List[QuizQuestion]]:
+        """
+        Get a placeholder roadmap and quiz to return when generation fails.
+
+        Returns:
+            Tuple[List[MicroLesson], List[QuizQuestion]]: The fallback roadmap
+            and quiz
+        """
+        return fallback_roadmap(), fallback_quiz()
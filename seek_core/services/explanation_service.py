@@ -6,14 +6,97 @@ a learner's learning style and educational background.
 """
 
 import logging
-from typing import Any, Dict, Optional
+import re
+import textwrap
+from typing import Any, AsyncIterator, Dict, Final, Iterator, Optional, Tuple
 
 from ..config import get_default_config
+from ..llm.cache import ResponseCache
 from ..llm.openai_service import LLMService
 from ..models.schemas import LearnerProfile
+from .prompts import (
+    STUDENT_INFORMATION_TEMPLATE,
+    semantic_context,
+    student_fields,
+)
 
 logger = logging.getLogger(__name__)
 
+_FALLBACK_EXPLANATION = (
+    "I'm sorry, I wasn't able to generate a personalized explanation at this time. "
+    "Let's continue with the learning roadmap and quiz to help you understand the concept better."
+)
+
+# Explanation guidance for each learning style, keyed by canonical style name
+_STYLE_GUIDANCE: Dict[str, str] = {
+    "visual": (
+        "- Use visual language and metaphors\n"
+        "- Describe visual elements like diagrams, charts, and images\n"
+        "- Use spatial relationships and visual organization\n"
+        "- Suggest the student draw or visualize concepts\n"
+        "- Reference colors, shapes, and patterns when relevant"
+    ),
+    "auditory": (
+        "- Use rhythmic language and mnemonics\n"
+        "- Include dialogue and discussion elements\n"
+        "- Suggest speaking concepts aloud or discussing with others\n"
+        "- Use sound-based metaphors and examples\n"
+        "- Emphasize the importance of listening and verbal repetition"
+    ),
+    "kinesthetic": (
+        "- Include hands-on activities and physical metaphors\n"
+        "- Suggest physical actions to practice concepts\n"
+        "- Use examples involving movement or physical manipulation\n"
+        "- Connect concepts to physical sensations and experiences\n"
+        "- Encourage learning through doing and practical application"
+    ),
+    "read_write": (
+        "- Use clear, concise written explanations\n"
+        "- Suggest note-taking strategies and written exercises\n"
+        "- Include lists, definitions, and key terms\n"
+        "- Reference written materials and examples\n"
+        "- Encourage summarizing concepts in writing"
+    ),
+    # Default guidance for unspecified learning styles
+    "default": (
+        "- Use a variety of examples and explanations\n"
+        "- Include multiple modalities (visual, verbal, practical)\n"
+        "- Focus on clear, structured explanations\n"
+        "- Provide concrete examples and applications\n"
+        "- Relate concepts to real-world scenarios"
+    ),
+}
+
+# Matches the first learning style keyword in a free-form style description
+_STYLE_PATTERN = re.compile(r"visual|auditory|kinesthetic|tactile|read|write", re.I)
+
+_STYLE_ALIASES = {"tactile": "kinesthetic", "read": "read_write", "write": "read_write"}
+
+_EXPLANATION_SYSTEM_PROMPT: Final[str] = textwrap.dedent("""
+    You are an expert educational content creator specializing in creating personalized explanations.
+    Your task is to create clear, engaging explanations that match the student's learning style
+    and build upon their existing knowledge while addressing their specific learning goal.
+    """).strip()
+
+# Static instructions come first so they form a cacheable prompt prefix;
+# the student details are filled in at the end
+_EXPLANATION_PROMPT_TEMPLATE: Final[str] = textwrap.dedent("""\
+        Create a personalized explanation of the concept related to the student's learning goal.
+
+        The explanation should:
+        - Use age-appropriate language and examples
+        - Connect to topics the student already knows when possible
+        - Address specific struggles the student has mentioned
+        - Be engaging and clear
+        - Be approximately 300-500 words in length
+
+        Format your response as a cohesive, friendly explanation that directly addresses the student.
+
+        GUIDELINES FOR EXPLANATION:
+        {guidance}
+
+        """) + STUDENT_INFORMATION_TEMPLATE
+
 
 class ExplanationService:
     """
@@ -35,6 +118,9 @@ class ExplanationService:
         """
         self.llm_service = llm_service
         self.config = config or get_default_config()
+        self._cache = ResponseCache(
+            maxsize=self.config.get("response_cache_size", 1024)
+        )
 
     def generate_explanation(self, learner: LearnerProfile) -> str:
         """
@@ -47,55 +133,160 @@ class ExplanationService:
             str: A personalized explanation tailored to the learner's style and needs
         """
         logger.info(
-            f"Generating explanation for learner with goal: {learner.goal} and learning style: {learner.learning_style}"
+            "Generating explanation for learner with goal: %s and learning style: %s",
+            learner.goal,
+            learner.learning_style,
         )
 
-        # Create a prompt based on learning style
-        learning_style_guidance = self._get_learning_style_guidance(
-            learner.learning_style
-        )
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return cached
 
-        prompt = f"""
-        Create a personalized explanation of the concept related to the student's learning goal.
+        prompt, system_prompt = self._build_prompts(learner)
 
-        STUDENT INFORMATION:
-        - Age: {learner.age}
-        - Grade level: {learner.grade_level}
-        - Learning style: {learner.learning_style}
-        - Topics they already know: {', '.join(learner.known_topics)}
-        - Topics they struggle with: {', '.join(learner.struggles)}
-        - Learning goal: {learner.goal}
+        try:
+            # Generate the explanation using the LLM
+            explanation = self.llm_service.generate_content(
+                prompt, system_prompt, semantic_context=semantic_context(learner)
+            )
 
-        GUIDELINES FOR EXPLANATION:
-        {learning_style_guidance}
+        except Exception as e:
+            logger.error("Error generating explanation: %s", e)
+            return _FALLBACK_EXPLANATION
 
-        The explanation should:
-        - Use age-appropriate language and examples
-        - Connect to topics the student already knows when possible
-        - Address specific struggles the student has mentioned
-        - Be engaging and clear
-        - Be approximately 300-500 words in length
+        self._cache.set(learner.cache_key, explanation)
+        return explanation
 
-        Format your response as a cohesive, friendly explanation that directly addresses the student.
+    async def agenerate_explanation(self, learner: LearnerProfile) -> str:
         """
+        Asynchronously generate a personalized explanation of a concept for a learner.
 
-        system_prompt = """
-        You are an expert educational content creator specializing in creating personalized explanations.
-        Your task is to create clear, engaging explanations that match the student's learning style
-        and build upon their existing knowledge while addressing their specific learning goal.
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            str: A personalized explanation tailored to the learner's style and needs
         """
+        logger.info(
+            "Generating explanation for learner with goal: %s and learning style: %s",
+            learner.goal,
+            learner.learning_style,
+        )
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return cached
+
+        prompt, system_prompt = self._build_prompts(learner)
 
         try:
             # Generate the explanation using the LLM
-            explanation = self.llm_service.generate_content(prompt, system_prompt)
-            return explanation
+            explanation = await self.llm_service.agenerate_content(
+                prompt, system_prompt, semantic_context=semantic_context(learner)
+            )
 
         except Exception as e:
-            logger.error(f"Error generating explanation: {str(e)}")
-            return (
-                "I'm sorry, I wasn't able to generate a personalized explanation at this time. "
-                "Let's continue with the learning roadmap and quiz to help you understand the concept better."
-            )
+            logger.error("Error generating explanation: %s", e)
+            return _FALLBACK_EXPLANATION
+
+        self._cache.set(learner.cache_key, explanation)
+        return explanation
+
+    def generate_explanation_stream(self, learner: LearnerProfile) -> Iterator[str]:
+        """
+        Generate a personalized explanation, yielding it as it is produced.
+
+        If generation fails before any text has been produced, the fallback
+        explanation is yielded instead; a failure part-way through ends the
+        stream early.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Yields:
+            str: Successive pieces of the explanation
+        """
+        logger.info(
+            "Streaming explanation for learner with goal: %s and learning style: %s",
+            learner.goal,
+            learner.learning_style,
+        )
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        prompt, system_prompt = self._build_prompts(learner)
+
+        parts = []
+        try:
+            for part in self.llm_service.stream_content(prompt, system_prompt):
+                parts.append(part)
+                yield part
+
+        except Exception as e:
+            logger.error("Error streaming explanation: %s", e)
+            if not parts:
+                yield _FALLBACK_EXPLANATION
+            return
+
+        self._cache.set(learner.cache_key, "".join(parts))
+
+    async def agenerate_explanation_stream(
+        self, learner: LearnerProfile
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously generate a personalized explanation, yielding it as it is produced.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Yields:
+            str: Successive pieces of the explanation
+        """
+        logger.info(
+            "Streaming explanation for learner with goal: %s and learning style: %s",
+            learner.goal,
+            learner.learning_style,
+        )
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        prompt, system_prompt = self._build_prompts(learner)
+
+        parts = []
+        try:
+            async for part in self.llm_service.astream_content(prompt, system_prompt):
+                parts.append(part)
+                yield part
+
+        except Exception as e:
+            logger.error("Error streaming explanation: %s", e)
+            if not parts:
+                yield _FALLBACK_EXPLANATION
+            return
+
+        self._cache.set(learner.cache_key, "".join(parts))
+
+    def _build_prompts(self, learner: LearnerProfile) -> Tuple[str, str]:
+        """
+        Build the user and system prompts for a learner's explanation.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            Tuple[str, str]: The user prompt and the system prompt
+        """
+        fields = student_fields(learner)
+        fields["guidance"] = self._get_learning_style_guidance(learner.learning_style)
+        prompt = _EXPLANATION_PROMPT_TEMPLATE.format_map(fields)
+
+        return prompt, _EXPLANATION_SYSTEM_PROMPT
 
     def _get_learning_style_guidance(self, learning_style: str) -> str:
         """
@@ -107,49 +298,17 @@ class ExplanationService:
         Returns:
             str: Guidance for creating content for this learning style
         """
-        learning_style = learning_style.lower()
-
-        if "visual" in learning_style:
-            return """
-            - Use visual language and metaphors
-            - Describe visual elements like diagrams, charts, and images
-            - Use spatial relationships and visual organization
-            - Suggest the student draw or visualize concepts
-            - Reference colors, shapes, and patterns when relevant
-            """
-        elif "auditory" in learning_style:
-            return """
-            - Use rhythmic language and mnemonics
-            - Include dialogue and discussion elements
-            - Suggest speaking concepts aloud or discussing with others
-            - Use sound-based metaphors and examples
-            - Emphasize the importance of listening and verbal repetition
-            """
-        elif "kinesthetic" in learning_style or "tactile" in learning_style:
-            return """
-            - Include hands-on activities and physical metaphors
-            - Suggest physical actions to practice concepts
-            - Use examples involving movement or physical manipulation
-            - Connect concepts to physical sensations and experiences
-            - Encourage learning through doing and practical application
-            """
-        elif "read" in learning_style or "write" in learning_style:
-            return """
-            - Use clear, concise written explanations
-            - Suggest note-taking strategies and written exercises
-            - Include lists, definitions, and key terms
-            - Reference written materials and examples
-            - Encourage summarizing concepts in writing
-            """
-        else:
-            # Default guidance for unspecified learning styles
-            return """
-            - Use a variety of examples and explanations
-            - Include multiple modalities (visual, verbal, practical)
-            - Focus on clear, structured explanations
-            - Provide concrete examples and applications
-            - Relate concepts to real-world scenarios
-            """
+        # Canonical style names are looked up directly, without the regex
+        guidance = _STYLE_GUIDANCE.get(learning_style.lower())
+        if guidance is not None:
+            return guidance
+
+        match = _STYLE_PATTERN.search(learning_style)
+        if match is None:
+            return _STYLE_GUIDANCE["default"]
+
+        style = match.group(0).lower()
+        return _STYLE_GUIDANCE[_STYLE_ALIASES.get(style, style)]
 
     def generate_resource_link(self, learner: LearnerProfile) -> str:
         """
@@ -167,7 +326,7 @@ class ExplanationService:
         # 3. Return a relevant link based on topic, learning style, age, etc.
 
         # For now, we're just returning a placeholder based on learning style
-        if learner.learning_style.lower() == "visual":
+        if learner.learning_style_key == "visual":
             return "https://www.khanacademy.org/math/arithmetic/fraction-arithmetic"
         return None
 
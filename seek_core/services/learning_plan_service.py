@@ -5,15 +5,23 @@ This module integrates the roadmap, quiz, and explanation services
 to create a comprehensive learning plan response.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 
 from ..config import get_default_config
+from ..llm.cache import SemanticCache
 from ..llm.openai_service import LLMService
-from ..models.schemas import LearnerProfile, LearningPlanResponse
-from .explanation_service import ExplanationService
-from .quiz_service import QuizService
-from .roadmap_service import RoadmapService
+from ..models.schemas import (
+    LearnerProfile,
+    LearningPlanResponse,
+    MicroLesson,
+    QuizQuestion,
+)
+from .explanation_service import _FALLBACK_EXPLANATION, ExplanationService
+from .quiz_service import _FALLBACK_QUIZ, QuizService
+from .roadmap_service import _FALLBACK_ROADMAP, RoadmapService
 
 logger = logging.getLogger(__name__)
 
@@ -44,53 +52,377 @@ class LearningPlanService:
         self.config = config or get_default_config()
 
         # Initialize services
-        self.llm_service = LLMService(api_key=api_key, model=model)
+        self.llm_service = LLMService.shared(api_key=api_key, model=model)
         self.roadmap_service = RoadmapService(self.llm_service, config=self.config)
         self.quiz_service = QuizService(self.llm_service, config=self.config)
         self.explanation_service = ExplanationService(
             self.llm_service, config=self.config
         )
 
+        # Optionally reuse plans generated for near-identical learners
+        self.plan_cache: Optional[SemanticCache] = None
+        if self.config.get("plan_cache_enabled"):
+            self.plan_cache = SemanticCache(
+                threshold=self.config.get("plan_cache_threshold", 0.92)
+            )
+
+        # Background workers for prefetch_learning_plans, started on first use
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+
     def generate_learning_plan(self, learner: LearnerProfile) -> LearningPlanResponse:
         """
         Generate a complete learning plan for a learner.
 
+        The roadmap, quiz, and explanation are generated concurrently, so the plan
+        takes about as long as the slowest of the three LLM calls.
+
         Args:
             learner (LearnerProfile): The learner's profile
 
         Returns:
             LearningPlanResponse: A complete learning plan with roadmap, quiz, and explanation
         """
-        logger.info(f"Generating learning plan for learner with goal: {learner.goal}")
+        logger.info("Generating learning plan for learner with goal: %s", learner.goal)
 
-        # Generate all components in parallel in a production environment
-        # For this MVP, we'll generate them sequentially
+        embedding = None
+        if self.plan_cache is not None:
+            try:
+                embedding = self.llm_service.embed(self._plan_cache_text(learner))
+            except Exception as e:
+                logger.warning("Error computing learner embedding: %s", e)
+            else:
+                cached = self.plan_cache.get(self._plan_namespace(learner), embedding)
+                if cached is not None:
+                    return cached
+
+        # The three components are independent network calls, so generate them
+        # in parallel threads (the OpenAI client releases the GIL while waiting)
         try:
-            roadmap = self.roadmap_service.generate_roadmap(learner)
-            quiz = self.quiz_service.generate_quiz(learner)
-            personalized_explanation = self.explanation_service.generate_explanation(
-                learner
-            )
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                roadmap_future = executor.submit(
+                    self.roadmap_service.generate_roadmap, learner
+                )
+                quiz_future = executor.submit(self.quiz_service.generate_quiz, learner)
+                explanation_future = executor.submit(
+                    self.explanation_service.generate_explanation, learner
+                )
+
+                roadmap = roadmap_future.result()
+                quiz = quiz_future.result()
+                personalized_explanation = explanation_future.result()
+
+            plan = self._assemble_plan(learner, roadmap, quiz, personalized_explanation)
+
+        except Exception as e:
+            logger.error("Error generating learning plan: %s", e)
+            raise
+
+        if embedding is not None and not self._uses_fallback(plan):
+            self.plan_cache.set(self._plan_namespace(learner), embedding, plan)
+        return plan
+
+    async def agenerate_learning_plan(
+        self, learner: LearnerProfile
+    ) -> LearningPlanResponse:
+        """
+        Asynchronously generate a complete learning plan for a learner.
+
+        The roadmap, quiz, and explanation are independent LLM calls, so they are
+        issued concurrently and the plan takes about as long as the slowest one.
 
-            # Get a resource link if the learner is a visual learner
-            resource_link = None
-            if learner.learning_style.lower() == "visual":
-                resource_link = self.explanation_service.generate_resource_link(learner)
-
-            # Combine everything into a learning plan response
-            learning_plan = LearningPlanResponse(
-                roadmap=roadmap,
-                quiz=quiz,
-                personalized_explanation=personalized_explanation,
-                resource_link=resource_link,
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            LearningPlanResponse: A complete learning plan with roadmap, quiz, and explanation
+        """
+        logger.info("Generating learning plan for learner with goal: %s", learner.goal)
+
+        embedding = None
+        if self.plan_cache is not None:
+            try:
+                embedding = await self.llm_service.aembed(
+                    self._plan_cache_text(learner)
+                )
+            except Exception as e:
+                logger.warning("Error computing learner embedding: %s", e)
+            else:
+                cached = self.plan_cache.get(self._plan_namespace(learner), embedding)
+                if cached is not None:
+                    return cached
+
+        try:
+            # Let all three calls finish before surfacing the first error
+            results = await asyncio.gather(
+                self.roadmap_service.agenerate_roadmap(learner),
+                self.quiz_service.agenerate_quiz(learner),
+                self.explanation_service.agenerate_explanation(learner),
+                return_exceptions=True,
             )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+            roadmap, quiz, personalized_explanation = results
 
-            return learning_plan
+            plan = self._assemble_plan(learner, roadmap, quiz, personalized_explanation)
 
         except Exception as e:
-            logger.error(f"Error generating learning plan: {str(e)}")
+            logger.error("Error generating learning plan: %s", e)
             raise
 
+        if embedding is not None and not self._uses_fallback(plan):
+            self.plan_cache.set(self._plan_namespace(learner), embedding, plan)
+        return plan
+
+    def generate_learning_plans(
+        self, learners: List[LearnerProfile]
+    ) -> List[LearningPlanResponse]:
+        """
+        Generate learning plans for several learners.
+
+        Up to plan_concurrency plans are generated at a time, to stay within
+        the API rate limits.
+
+        Args:
+            learners (List[LearnerProfile]): The learners' profiles
+
+        Returns:
+            List[LearningPlanResponse]: The learning plans, in the same order as learners
+        """
+        concurrency = max(1, self.config.get("plan_concurrency", 8))
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(self.generate_learning_plan, learners))
+
+    async def agenerate_learning_plans(
+        self, learners: List[LearnerProfile]
+    ) -> List[LearningPlanResponse]:
+        """
+        Asynchronously generate learning plans for several learners.
+
+        Up to plan_concurrency plans are generated at a time, to stay within
+        the API rate limits.
+
+        Args:
+            learners (List[LearnerProfile]): The learners' profiles
+
+        Returns:
+            List[LearningPlanResponse]: The learning plans, in the same order as learners
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.get("plan_concurrency", 8)))
+
+        async def generate(learner: LearnerProfile) -> LearningPlanResponse:
+            async with semaphore:
+                return await self.agenerate_learning_plan(learner)
+
+        # Let every plan finish before surfacing the first error
+        results = await asyncio.gather(
+            *(generate(learner) for learner in learners), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        return results
+
+    def prefetch_learning_plans(
+        self, learners: List[LearnerProfile]
+    ) -> List["Future[LearningPlanResponse]"]:
+        """
+        Start generating learning plans in the background to warm the caches.
+
+        Use this when the next learners are already known, e.g. the rest of a
+        class roster after the first upload. Once a prefetch has finished, a
+        generate_learning_plan call for the same learner is served from the
+        component caches without calling the API.
+
+        Args:
+            learners (List[LearnerProfile]): The learners whose plans will be requested
+
+        Returns:
+            List[Future[LearningPlanResponse]]: Futures for the prefetched plans
+        """
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=max(1, self.config.get("plan_concurrency", 8)),
+                thread_name_prefix="seek-prefetch",
+            )
+
+        return [
+            self._prefetch_executor.submit(self.generate_learning_plan, learner)
+            for learner in learners
+        ]
+
+    def shutdown_prefetch(self, wait: bool = True) -> None:
+        """
+        Stop the background prefetch workers.
+
+        Args:
+            wait (bool): Whether to wait for prefetches in progress to finish
+        """
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=wait)
+            self._prefetch_executor = None
+
+    async def agenerate_learning_plan_stream(
+        self, learner: LearnerProfile
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate a learning plan, yielding each part as soon as it is ready.
+
+        The explanation is streamed while the roadmap and quiz are generated.
+        Events are (kind, value) pairs:
+
+        - ("explanation", str): the next piece of the explanation
+        - ("roadmap", List[MicroLesson]): the finished roadmap
+        - ("quiz", List[QuizQuestion]): the finished quiz
+        - ("plan", LearningPlanResponse): the complete plan, always last
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Yields:
+            Tuple[str, Any]: The kind of event and its value
+        """
+        logger.info("Streaming learning plan for learner with goal: %s", learner.goal)
+
+        events: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+
+        async def put_result(kind: str, result: Awaitable[Any]) -> None:
+            try:
+                events.put_nowait((kind, await result))
+            except Exception as e:
+                events.put_nowait(("error", e))
+
+        async def put_explanation() -> None:
+            parts = []
+            try:
+                stream = self.explanation_service.agenerate_explanation_stream(learner)
+                async for part in stream:
+                    parts.append(part)
+                    events.put_nowait(("explanation", part))
+                events.put_nowait(("personalized_explanation", "".join(parts)))
+            except Exception as e:
+                events.put_nowait(("error", e))
+
+        tasks = [
+            asyncio.ensure_future(
+                put_result("roadmap", self.roadmap_service.agenerate_roadmap(learner))
+            ),
+            asyncio.ensure_future(
+                put_result("quiz", self.quiz_service.agenerate_quiz(learner))
+            ),
+            asyncio.ensure_future(put_explanation()),
+        ]
+
+        results: Dict[str, Any] = {}
+        try:
+            while len(results) < len(tasks):
+                kind, value = await events.get()
+                if kind == "error":
+                    logger.error("Error generating learning plan: %s", value)
+                    raise value
+                if kind == "explanation":
+                    yield kind, value
+                    continue
+
+                results[kind] = value
+                if kind != "personalized_explanation":
+                    yield kind, value
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield "plan", self._assemble_plan(
+            learner,
+            results["roadmap"],
+            results["quiz"],
+            results["personalized_explanation"],
+        )
+
+    @staticmethod
+    def _plan_cache_text(learner: LearnerProfile) -> str:
+        """
+        Build the text embedded to find plans for similar learners.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            str: The learner's goal, struggles, learning style and grade level
+        """
+        struggles = ",".join(sorted(learner.struggles))
+        return (
+            f"{learner.goal}|{struggles}|{learner.learning_style}|{learner.grade_level}"
+        )
+
+    @staticmethod
+    def _uses_fallback(plan: LearningPlanResponse) -> bool:
+        """
+        Check whether any part of a plan is placeholder content.
+
+        Such plans are not cached, so that similar learners get a fresh attempt
+        instead of the placeholder.
+
+        Args:
+            plan (LearningPlanResponse): The assembled learning plan
+
+        Returns:
+            bool: True if a component service fell back to its placeholder
+        """
+        return (
+            any(lesson in _FALLBACK_ROADMAP for lesson in plan.roadmap)
+            or any(question in _FALLBACK_QUIZ for question in plan.quiz)
+            or plan.personalized_explanation == _FALLBACK_EXPLANATION
+        )
+
+    @staticmethod
+    def _plan_namespace(learner: LearnerProfile) -> Tuple[Any, ...]:
+        """
+        Get the plan cache namespace for a learner.
+
+        Plans are only reused between learners in the same grade with the same
+        learning style, however similar their goals are.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            Tuple[Any, ...]: The grade level and normalized learning style
+        """
+        return (learner.grade_level, learner.learning_style_key)
+
+    def _assemble_plan(
+        self,
+        learner: LearnerProfile,
+        roadmap: List[MicroLesson],
+        quiz: List[QuizQuestion],
+        personalized_explanation: str,
+    ) -> LearningPlanResponse:
+        """
+        Combine the generated components into a learning plan response.
+
+        The lessons and questions were already validated when the component
+        services built them, so the response is constructed without validating
+        them a second time.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+            roadmap (List[MicroLesson]): The generated roadmap
+            quiz (List[QuizQuestion]): The generated quiz
+            personalized_explanation (str): The generated explanation
+
+        Returns:
+            LearningPlanResponse: The complete learning plan
+        """
+        # Combine everything into a learning plan response; the explanation
+        # service decides whether the learner gets a resource link
+        return LearningPlanResponse.model_construct(
+            roadmap=roadmap,
+            quiz=quiz,
+            personalized_explanation=personalized_explanation,
+            resource_link=self.explanation_service.generate_resource_link(learner),
+        )
+
     # TODO: Add methods for updating learning plans based on learner feedback
-    # TODO: Implement caching for efficient generation of similar plans
     # TODO: Add analytics tracking for learning plan effectiveness
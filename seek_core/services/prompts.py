@@ -0,0 +1,64 @@
+"""
+Prompt fragments shared by the content generation services.
+
+Each service puts its static instructions first and the learner-specific
+details last, so that requests for different learners share an identical
+prefix that the OpenAI API can serve from its prompt cache.
+"""
+
+import textwrap
+from typing import Dict, Final, Tuple
+
+from ..models.schemas import LearnerProfile
+
+# The end of every generation prompt, filled in with student_fields()
+STUDENT_INFORMATION_TEMPLATE: Final[str] = textwrap.dedent("""\
+    STUDENT INFORMATION:
+    - Age: {age}
+    - Grade level: {grade_level}
+    - Learning style: {learning_style}
+    - Topics they already know: {known_topics}
+    - Topics they struggle with: {struggles}
+    - Learning goal: {goal}
+    """)
+
+
+def student_fields(learner: LearnerProfile) -> Dict[str, str]:
+    """
+    Get the values for the placeholders of STUDENT_INFORMATION_TEMPLATE.
+
+    Args:
+        learner (LearnerProfile): The learner's profile
+
+    Returns:
+        Dict[str, str]: The learner's details, keyed by placeholder name
+    """
+    return {
+        "age": str(learner.age),
+        "grade_level": str(learner.grade_level),
+        "learning_style": learner.learning_style,
+        "known_topics": learner.known_topics_csv,
+        "struggles": learner.struggles_csv,
+        "goal": learner.goal,
+    }
+
+
+def semantic_context(learner: LearnerProfile) -> Tuple[Tuple[str, ...], str]:
+    """
+    Get the semantic cache context of a learner's generation request.
+
+    Every detail but the goal must match exactly for a cached response to be
+    reused, and only the goal is embedded. Embedding the whole prompt would let
+    its fixed instructions dominate the similarity, so learners differing only
+    in age or grade would share content.
+
+    Args:
+        learner (LearnerProfile): The learner's profile
+
+    Returns:
+        Tuple[Tuple[str, ...], str]: The exact-match details and the goal
+    """
+    fields = student_fields(learner)
+    goal = fields.pop("goal")
+    fields["learning_style"] = learner.learning_style_key
+    return tuple(fields.values()), goal
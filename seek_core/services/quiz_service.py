@@ -5,16 +5,144 @@ This module handles the creation of adaptive quiz questions to test
 a learner's understanding of educational content.
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional
+import textwrap
+from typing import Any, Dict, Final, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from ..config import get_default_config
+from ..llm.cache import ResponseCache
+from ..llm.json_stream import iter_array_items
 from ..llm.openai_service import LLMService
 from ..models.schemas import LearnerProfile, QuizQuestion
+from .prompts import (
+    STUDENT_INFORMATION_TEMPLATE,
+    semantic_context,
+    student_fields,
+)
 
 logger = logging.getLogger(__name__)
 
+# Validates the whole list of questions in one call instead of one model at a time
+_QUIZ_ADAPTER = TypeAdapter(List[QuizQuestion])
+
+
+class _QuizPayload(BaseModel):
+    """The JSON object the model is asked to return."""
+
+    model_config = ConfigDict(extra="forbid", title="quiz")
+
+    questions: List[QuizQuestion]
+
+
+# Structured-output schema, so the API only returns conforming questions
+_QUIZ_SCHEMA = _QuizPayload.model_json_schema()
+
+_QUIZ_SYSTEM_PROMPT: Final[str] = textwrap.dedent("""
+    You are an expert educational assessment creator specializing in developing personalized quizzes.
+    Your task is to create clear, engaging multiple-choice questions that appropriately assess
+    the student's understanding of concepts related to their learning goal.
+    Questions should be age-appropriate and align with the student's grade level.
+    """).strip()
+
+# Static instructions come first so they form a cacheable prompt prefix;
+# the student details are filled in at the end
+_QUIZ_PROMPT_TEMPLATE: Final[str] = textwrap.dedent("""\
+        Create a personalized quiz consisting of 3-5 multiple-choice questions to assess understanding of concepts related to the student's learning goal.
+
+        Each quiz question should include:
+        1. A clear question that tests understanding, not just memorization (at most 30 words)
+        2. Four multiple-choice options (labeled A, B, C, D; at most 12 words each)
+        3. The correct answer index (0 for A, 1 for B, 2 for C, 3 for D)
+        4. A brief explanation of why the correct answer is right (at most 40 words)
+
+        The questions should vary in difficulty, testing different aspects of the learning goal.
+        Use age-appropriate language and examples.
+
+        Return the questions in the "questions" array of your response, as minified JSON with no whitespace between tokens.
+
+        """) + STUDENT_INFORMATION_TEMPLATE
+
+
+# Placeholder quiz returned when generation fails. The models are frozen, so
+# the same instances can be handed out every time.
+_FALLBACK_QUIZ: Final[Tuple[QuizQuestion, ...]] = (
+    QuizQuestion(
+        question="What is the first step in solving this type of problem?",
+        options=["A. Step 1", "B. Step 2", "C. Step 3", "D. Step 4"],
+        correct_answer_index=0,
+        explanation="This is a placeholder question due to an error in generation.",
+    ),
+    QuizQuestion(
+        question="Which concept is most important to understand?",
+        options=[
+            "A. Concept 1",
+            "B. Concept 2",
+            "C. Concept 3",
+            "D. Concept 4",
+        ],
+        correct_answer_index=1,
+        explanation="This is a placeholder question due to an error in generation.",
+    ),
+    QuizQuestion(
+        question="How would you apply this knowledge?",
+        options=[
+            "A. Application 1",
+            "B. Application 2",
+            "C. Application 3",
+            "D. Application 4",
+        ],
+        correct_answer_index=2,
+        explanation="This is a placeholder question due to an error in generation.",
+    ),
+)
+
+
+def parse_quiz(quiz_data: Dict[str, Any], config: Dict[str, Any]) -> List[QuizQuestion]:
+    """
+    Convert the LLM's JSON response into a list of quiz questions.
+
+    Args:
+        quiz_data (Dict[str, Any]): The decoded JSON response
+        config (Dict[str, Any]): Configuration options
+
+    Returns:
+        List[QuizQuestion]: The quiz questions, truncated to max_quiz_questions
+    """
+    # Convert the JSON response to a list of QuizQuestion objects
+    quiz = _QUIZ_ADAPTER.validate_python(quiz_data["questions"])
+
+    # Ensure we have at least min_questions and at most max_questions
+    min_questions = config.get("min_quiz_questions", 3)
+    max_questions = config.get("max_quiz_questions", 5)
+
+    if len(quiz) < min_questions:
+        logger.warning(
+            "Generated quiz has fewer than %d questions: %d",
+            min_questions,
+            len(quiz),
+        )
+    elif len(quiz) > max_questions:
+        logger.warning(
+            "Generated quiz has more than %d questions: %d",
+            max_questions,
+            len(quiz),
+        )
+        quiz = quiz[:max_questions]  # Truncate to max_questions
+
+    return quiz
+
+
+def fallback_quiz() -> List[QuizQuestion]:
+    """
+    Get a placeholder quiz to return when generation fails.
+
+    Returns:
+        List[QuizQuestion]: A generic three-question quiz
+    """
+    return list(_FALLBACK_QUIZ)
+
 
 class QuizService:
     """
@@ -25,7 +153,10 @@ class QuizService:
     """
 
     def __init__(
-        self, llm_service: LLMService, config: Optional[Dict[str, Any]] = None
+        self,
+        llm_service: LLMService,
+        config: Optional[Dict[str, Any]] = None,
+        cache: bool = True,
     ):
         """
         Initialize the quiz service with an LLM service.
@@ -33,9 +164,15 @@ class QuizService:
         Args:
             llm_service (LLMService): The LLM service to use for generation
             config (Optional[Dict[str, Any]]): Configuration options
+            cache (bool): Whether to reuse quizzes generated for the same profile
         """
         self.llm_service = llm_service
         self.config = config or get_default_config()
+        cache_size = self.config.get("response_cache_size", 1024) if cache else 0
+        self._cache = ResponseCache(maxsize=cache_size)
+
+        # Multiple-choice questions are simple enough for a smaller, faster model
+        self.model = self.config.get("quiz_model")
 
     def generate_quiz(self, learner: LearnerProfile) -> List[QuizQuestion]:
         """
@@ -47,108 +184,139 @@ class QuizService:
         Returns:
             List[QuizQuestion]: A list of 3-5 multiple-choice quiz questions
         """
-        logger.info(f"Generating quiz for learner with goal: {learner.goal}")
+        logger.info("Generating quiz for learner with goal: %s", learner.goal)
 
-        # Create a prompt for the LLM
-        prompt = f"""
-        Create a personalized quiz consisting of 3-5 multiple-choice questions to assess understanding of concepts related to the student's learning goal.
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return list(cached)
 
-        STUDENT INFORMATION:
-        - Age: {learner.age}
-        - Grade level: {learner.grade_level}
-        - Learning style: {learner.learning_style}
-        - Topics they already know: {', '.join(learner.known_topics)}
-        - Topics they struggle with: {', '.join(learner.struggles)}
-        - Learning goal: {learner.goal}
+        prompt, system_prompt = self._build_prompts(learner)
 
-        Each quiz question should include:
-        1. A clear question that tests understanding, not just memorization
-        2. Four multiple-choice options (labeled A, B, C, D)
-        3. The correct answer index (0 for A, 1 for B, 2 for C, 3 for D)
-        4. A brief explanation of why the correct answer is right
+        try:
+            # Generate the quiz using the LLM
+            quiz_data = self.llm_service.generate_json_content(
+                prompt,
+                system_prompt,
+                schema=_QUIZ_SCHEMA,
+                max_tokens=self.config.get("quiz_max_tokens"),
+                model=self.model,
+                semantic_context=semantic_context(learner),
+            )
+            quiz = parse_quiz(quiz_data, self.config)
 
-        The questions should vary in difficulty, testing different aspects of the learning goal.
-        Use age-appropriate language and examples.
+        except Exception as e:
+            logger.error("Error generating quiz: %s", e)
+            return fallback_quiz()
+
+        self._cache.set(learner.cache_key, tuple(quiz))
+        return quiz
 
-        Format your response as a JSON array with the following structure:
-        [
-            {{
-                "question": "What is X?",
-                "options": ["A. Option 1", "B. Option 2", "C. Option 3", "D. Option 4"],
-                "correct_answer_index": 2,
-                "explanation": "Explanation why C is correct"
-            }},
-            // more questions...
-        ]
+    async def agenerate_quiz(self, learner: LearnerProfile) -> List[QuizQuestion]:
         """
+        Asynchronously generate a personalized quiz for a learner.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
 
-        system_prompt = """
-        You are an expert educational assessment creator specializing in developing personalized quizzes.
-        Your task is to create clear, engaging multiple-choice questions that appropriately assess
-        the student's understanding of concepts related to their learning goal.
-        Questions should be age-appropriate and align with the student's grade level.
-        Always format your response as valid JSON.
+        Returns:
+            List[QuizQuestion]: A list of 3-5 multiple-choice quiz questions
         """
+        logger.info("Generating quiz for learner with goal: %s", learner.goal)
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return list(cached)
+
+        prompt, system_prompt = self._build_prompts(learner)
 
         try:
             # Generate the quiz using the LLM
-            json_response = self.llm_service.generate_json_content(
-                prompt, system_prompt
+            quiz_data = await self.llm_service.agenerate_json_content(
+                prompt,
+                system_prompt,
+                schema=_QUIZ_SCHEMA,
+                max_tokens=self.config.get("quiz_max_tokens"),
+                model=self.model,
+                semantic_context=semantic_context(learner),
             )
-            quiz_data = json.loads(json_response)
+            quiz = parse_quiz(quiz_data, self.config)
+
+        except Exception as e:
+            logger.error("Error generating quiz: %s", e)
+            return fallback_quiz()
+
+        self._cache.set(learner.cache_key, tuple(quiz))
+        return quiz
+
+    def igenerate_quiz(self, learner: LearnerProfile) -> Iterator[QuizQuestion]:
+        """
+        Generate a personalized quiz, yielding each question as soon as it is complete.
 
-            # Convert the JSON response to a list of QuizQuestion objects
-            quiz = [QuizQuestion(**question) for question in quiz_data]
+        This lets a caller show the first question while the rest are still
+        being generated. If generation fails before any question is produced,
+        the placeholder quiz is yielded instead.
 
-            # Ensure we have at least min_questions and at most max_questions
-            min_questions = self.config.get("min_quiz_questions", 3)
-            max_questions = self.config.get("max_quiz_questions", 5)
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Yields:
+            QuizQuestion: Each of the 3-5 multiple-choice quiz questions, in order
+        """
+        logger.info("Generating quiz for learner with goal: %s", learner.goal)
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            yield from cached
+            return
 
-            if len(quiz) < min_questions:
-                logger.warning(
-                    f"Generated quiz has fewer than {min_questions} questions: {len(quiz)}"
-                )
-            elif len(quiz) > max_questions:
-                logger.warning(
-                    f"Generated quiz has more than {max_questions} questions: {len(quiz)}"
-                )
-                quiz = quiz[:max_questions]  # Truncate to max_questions
+        prompt, system_prompt = self._build_prompts(learner)
+        max_questions = self.config.get("max_quiz_questions", 5)
+        quiz: List[QuizQuestion] = []
 
-            return quiz
+        try:
+            # Stream the quiz from the LLM and decode the questions as they arrive
+            chunks = self.llm_service.stream_json_content(
+                prompt,
+                system_prompt,
+                schema=_QUIZ_SCHEMA,
+                max_tokens=self.config.get("quiz_max_tokens"),
+                model=self.model,
+            )
+            for item in iter_array_items(chunks, "questions"):
+                quiz.append(QuizQuestion.model_validate(item))
+                yield quiz[-1]
+                if len(quiz) == max_questions:
+                    break
 
         except Exception as e:
-            logger.error(f"Error generating quiz: {str(e)}")
-            # Provide a fallback quiz in case of errors
-            return [
-                QuizQuestion(
-                    question="What is the first step in solving this type of problem?",
-                    options=["A. Step 1", "B. Step 2", "C. Step 3", "D. Step 4"],
-                    correct_answer_index=0,
-                    explanation="This is a placeholder question due to an error in generation.",
-                ),
-                QuizQuestion(
-                    question="Which concept is most important to understand?",
-                    options=[
-                        "A. Concept 1",
-                        "B. Concept 2",
-                        "C. Concept 3",
-                        "D. Concept 4",
-                    ],
-                    correct_answer_index=1,
-                    explanation="This is a placeholder question due to an error in generation.",
-                ),
-                QuizQuestion(
-                    question="How would you apply this knowledge?",
-                    options=[
-                        "A. Application 1",
-                        "B. Application 2",
-                        "C. Application 3",
-                        "D. Application 4",
-                    ],
-                    correct_answer_index=2,
-                    explanation="This is a placeholder question due to an error in generation.",
-                ),
-            ]
+            logger.error("Error generating quiz: %s", e)
+            if not quiz:
+                yield from _FALLBACK_QUIZ
+            return
+
+        min_questions = self.config.get("min_quiz_questions", 3)
+        if len(quiz) < min_questions:
+            logger.warning(
+                "Generated quiz has fewer than %d questions: %d",
+                min_questions,
+                len(quiz),
+            )
+
+        self._cache.set(learner.cache_key, tuple(quiz))
+
+    def _build_prompts(self, learner: LearnerProfile) -> Tuple[str, str]:
+        """
+        Build the user and system prompts for a learner's quiz.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
+
+        Returns:
+            Tuple[str, str]: The user prompt and the system prompt
+        """
+        prompt = _QUIZ_PROMPT_TEMPLATE.format_map(student_fields(learner))
+
+        return prompt, _QUIZ_SYSTEM_PROMPT
 
     # TODO: Implement adaptive quiz generation based on learner performance
     # TODO: Add support for different question types (not just multiple choice)
@@ -5,16 +5,132 @@ This module handles the creation of structured learning paths tailored
 to a learner's specific needs and goals.
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional
+import textwrap
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from ..config import get_default_config
+from ..llm.cache import ResponseCache
 from ..llm.openai_service import LLMService
 from ..models.schemas import LearnerProfile, MicroLesson
+from .prompts import (
+    STUDENT_INFORMATION_TEMPLATE,
+    semantic_context,
+    student_fields,
+)
 
 logger = logging.getLogger(__name__)
 
+# Validates the whole list of lessons in one call instead of one model at a time
+_ROADMAP_ADAPTER = TypeAdapter(List[MicroLesson])
+
+
+class _RoadmapPayload(BaseModel):
+    """The JSON object the model is asked to return."""
+
+    model_config = ConfigDict(extra="forbid", title="roadmap")
+
+    lessons: List[MicroLesson]
+
+
+# Structured-output schema, so the API only returns conforming lessons
+_ROADMAP_SCHEMA = _RoadmapPayload.model_json_schema()
+
+_ROADMAP_SYSTEM_PROMPT: Final[str] = textwrap.dedent("""
+    You are an expert educational content creator specializing in creating personalized learning paths.
+    Your task is to create engaging, age-appropriate micro-lessons that match the student's learning style
+    and build toward their specific learning goal. Focus on clarity, engagement, and logical progression.
+    """).strip()
+
+# Static instructions come first so they form a cacheable prompt prefix;
+# the student details are filled in at the end
+_ROADMAP_PROMPT_TEMPLATE: Final[str] = textwrap.dedent("""\
+        Create a personalized learning roadmap consisting of 3-5 micro-lessons to help a student achieve their learning goal.
+
+        Each micro-lesson should include:
+        1. A clear, engaging title (at most 10 words)
+        2. A brief description of what will be learned (at most 15 words)
+        3. Estimated time to complete in minutes (between 5-15 minutes per lesson)
+        4. Content that teaches the concept in a way that's appropriate for the student's age and learning style (at most 120 words)
+
+        The lessons should build upon each other and be sequenced logically to help the student progress toward their goal.
+        Return the micro-lessons in order in the "lessons" array of your response, as minified JSON with no whitespace between tokens.
+
+        """) + STUDENT_INFORMATION_TEMPLATE
+
+
+# Placeholder roadmap returned when generation fails. The models are frozen, so
+# the same instances can be handed out every time.
+_FALLBACK_ROADMAP: Final[Tuple[MicroLesson, ...]] = (
+    MicroLesson(
+        title="Understanding the Basics",
+        description="Introduction to the fundamental concepts",
+        estimated_time_minutes=10,
+        content="This is a placeholder lesson due to an error in generation.",
+    ),
+    MicroLesson(
+        title="Building Core Skills",
+        description="Practice with key techniques",
+        estimated_time_minutes=10,
+        content="This is a placeholder lesson due to an error in generation.",
+    ),
+    MicroLesson(
+        title="Applying Your Knowledge",
+        description="Real-world applications and practice",
+        estimated_time_minutes=10,
+        content="This is a placeholder lesson due to an error in generation.",
+    ),
+)
+
+
+def parse_roadmap(
+    roadmap_data: Dict[str, Any], config: Dict[str, Any]
+) -> List[MicroLesson]:
+    """
+    Convert the LLM's JSON response into a list of micro-lessons.
+
+    Args:
+        roadmap_data (Dict[str, Any]): The decoded JSON response
+        config (Dict[str, Any]): Configuration options
+
+    Returns:
+        List[MicroLesson]: The micro-lessons, truncated to max_lessons
+    """
+    # Convert the JSON response to a list of MicroLesson objects
+    roadmap = _ROADMAP_ADAPTER.validate_python(roadmap_data["lessons"])
+
+    # Ensure we have at least min_lessons and at most max_lessons
+    min_lessons = config.get("min_lessons", 3)
+    max_lessons = config.get("max_lessons", 5)
+
+    if len(roadmap) < min_lessons:
+        logger.warning(
+            "Generated roadmap has fewer than %d lessons: %d",
+            min_lessons,
+            len(roadmap),
+        )
+    elif len(roadmap) > max_lessons:
+        logger.warning(
+            "Generated roadmap has more than %d lessons: %d",
+            max_lessons,
+            len(roadmap),
+        )
+        roadmap = roadmap[:max_lessons]  # Truncate to max_lessons
+
+    return roadmap
+
+
+def fallback_roadmap() -> List[MicroLesson]:
+    """
+    Get a placeholder roadmap to return when generation fails.
+
+    Returns:
+        List[MicroLesson]: A generic three-lesson roadmap
+    """
+    return list(_FALLBACK_ROADMAP)
+
 
 class RoadmapService:
     """
@@ -36,6 +152,9 @@ class RoadmapService:
         """
         self.llm_service = llm_service
         self.config = config or get_default_config()
+        self._cache = ResponseCache(
+            maxsize=self.config.get("response_cache_size", 1024)
+        )
 
     def generate_roadmap(self, learner: LearnerProfile) -> List[MicroLesson]:
         """
@@ -47,95 +166,81 @@ class RoadmapService:
         Returns:
             List[MicroLesson]: A list of 3-5 micro-lessons forming a learning roadmap
         """
-        logger.info(f"Generating roadmap for learner with goal: {learner.goal}")
+        logger.info("Generating roadmap for learner with goal: %s", learner.goal)
 
-        # Create a prompt for the LLM
-        prompt = f"""
-        Create a personalized learning roadmap consisting of 3-5 micro-lessons to help a student achieve their learning goal.
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return list(cached)
 
-        STUDENT INFORMATION:
-        - Age: {learner.age}
-        - Grade level: {learner.grade_level}
-        - Learning style: {learner.learning_style}
-        - Topics they already know: {', '.join(learner.known_topics)}
-        - Topics they struggle with: {', '.join(learner.struggles)}
-        - Learning goal: {learner.goal}
+        prompt, system_prompt = self._build_prompts(learner)
 
-        Each micro-lesson should include:
-        1. A clear, engaging title
-        2. A brief description of what will be learned
-        3. Estimated time to complete in minutes (between 5-15 minutes per lesson)
-        4. Detailed content that teaches the concept in a way that's appropriate for the student's age and learning style
+        try:
+            # Generate the roadmap using the LLM
+            roadmap_data = self.llm_service.generate_json_content(
+                prompt,
+                system_prompt,
+                schema=_ROADMAP_SCHEMA,
+                max_tokens=self.config.get("roadmap_max_tokens"),
+                semantic_context=semantic_context(learner),
+            )
+            roadmap = parse_roadmap(roadmap_data, self.config)
 
-        The lessons should build upon each other and be sequenced logically to help the student progress toward their goal.
-        Format your response as a JSON array of lessons with the following structure:
-        [
-            {{
-                "title": "Lesson Title",
-                "description": "Brief description",
-                "estimated_time_minutes": 10,
-                "content": "Detailed lesson content"
-            }},
-            // more lessons...
-        ]
+        except Exception as e:
+            logger.error("Error generating roadmap: %s", e)
+            return fallback_roadmap()
+
+        self._cache.set(learner.cache_key, tuple(roadmap))
+        return roadmap
+
+    async def agenerate_roadmap(self, learner: LearnerProfile) -> List[MicroLesson]:
         """
+        Asynchronously generate a personalized learning roadmap for a learner.
+
+        Args:
+            learner (LearnerProfile): The learner's profile
 
-        system_prompt = """
-        You are an expert educational content creator specializing in creating personalized learning paths.
-        Your task is to create engaging, age-appropriate micro-lessons that match the student's learning style
-        and build toward their specific learning goal. Focus on clarity, engagement, and logical progression.
-        Always format your response as valid JSON.
+        Returns:
+            List[MicroLesson]: A list of 3-5 micro-lessons forming a learning roadmap
         """
+        logger.info("Generating roadmap for learner with goal: %s", learner.goal)
+
+        cached = self._cache.get(learner.cache_key)
+        if cached is not None:
+            return list(cached)
+
+        prompt, system_prompt = self._build_prompts(learner)
 
         try:
             # Generate the roadmap using the LLM
-            json_response = self.llm_service.generate_json_content(
-                prompt, system_prompt
+            roadmap_data = await self.llm_service.agenerate_json_content(
+                prompt,
+                system_prompt,
+                schema=_ROADMAP_SCHEMA,
+                max_tokens=self.config.get("roadmap_max_tokens"),
+                semantic_context=semantic_context(learner),
             )
-            roadmap_data = json.loads(json_response)
+            roadmap = parse_roadmap(roadmap_data, self.config)
+
+        except Exception as e:
+            logger.error("Error generating roadmap: %s", e)
+            return fallback_roadmap()
 
-            # Convert the JSON response to a list of MicroLesson objects
-            roadmap = [MicroLesson(**lesson) for lesson in roadmap_data]
+        self._cache.set(learner.cache_key, tuple(roadmap))
+        return roadmap
 
-            # Ensure we have at least min_lessons and at most max_lessons
-            min_lessons = self.config.get("min_lessons", 3)
-            max_lessons = self.config.get("max_lessons", 5)
+    def _build_prompts(self, learner: LearnerProfile) -> Tuple[str, str]:
+        """
+        Build the user and system prompts for a learner's roadmap.
 
-            if len(roadmap) < min_lessons:
-                logger.warning(
-                    f"Generated roadmap has fewer than {min_lessons} lessons: {len(roadmap)}"
-                )
-            elif len(roadmap) > max_lessons:
-                logger.warning(
-                    f"Generated roadmap has more than {max_lessons} lessons: {len(roadmap)}"
-                )
-                roadmap = roadmap[:max_lessons]  # Truncate to max_lessons
+        Args:
+            learner (LearnerProfile): The learner's profile
 
-            return roadmap
+        Returns:
+            Tuple[str, str]: The user prompt and the system prompt
+        """
+        prompt = _ROADMAP_PROMPT_TEMPLATE.format_map(student_fields(learner))
 
-        except Exception as e:
-            logger.error(f"Error generating roadmap: {str(e)}")
-            # Provide a fallback roadmap in case of errors
-            return [
-                MicroLesson(
-                    title="Understanding the Basics",
-                    description="Introduction to the fundamental concepts",
-                    estimated_time_minutes=10,
-                    content="This is a placeholder lesson due to an error in generation.",
-                ),
-                MicroLesson(
-                    title="Building Core Skills",
-                    description="Practice with key techniques",
-                    estimated_time_minutes=10,
-                    content="This is a placeholder lesson due to an error in generation.",
-                ),
-                MicroLesson(
-                    title="Applying Your Knowledge",
-                    description="Real-world applications and practice",
-                    estimated_time_minutes=10,
-                    content="This is a placeholder lesson due to an error in generation.",
-                ),
-            ]
+        return prompt, _ROADMAP_SYSTEM_PROMPT
 
     # TODO: Add methods for adapting roadmaps based on learning progress
     # TODO: Implement more sophisticated sequencing algorithms
@@ -7,8 +7,13 @@ setup(
     install_requires=[
         "pydantic>=2.0",
         "openai>=1.0.0",
+        "httpx",
         "pytest>=7.0.0"
     ],
+    extras_require={
+        "fast": ["orjson>=3.0.0"],
+        "http2": ["httpx[http2]"],
+    },
     description="Seek's core logic for roadmap generation and adaptive learning",
     author="Petimus",
 )
@@ -4,41 +4,138 @@ Pytest configuration for the seek_core package tests.
 This file contains fixtures and configuration for pytest tests.
 """
 
-from unittest.mock import MagicMock
+from pathlib import Path
 
 import pytest
 
-from seek_core.llm.openai_service import LLMService
+from seek_core.config import get_default_config
+from seek_core.llm.openai_service import _json_loads
 from seek_core.models.schemas import LearnerProfile
+from seek_core.services.quiz_service import QuizService
+from seek_core.services.roadmap_service import RoadmapService
+from tests.helpers import stub_llm
 
+# Sample LLM responses, stored as the raw JSON bytes the API would return
+FIXTURES = Path(__file__).parent / "fixtures"
 
-@pytest.fixture
+# LearnerProfile is frozen, so a single validated instance can be shared by
+# every test in the session; tests needing a variant use model_copy()
+_PROFILE = LearnerProfile(
+    age=12,
+    grade_level=6,
+    learning_style="visual",
+    known_topics=["fractions"],
+    struggles=["decimals", "percentages"],
+    goal="master converting between decimals and fractions",
+)
+
+
+@pytest.fixture(scope="module")
 def mock_llm_service():
     """
-    Fixture providing a mock LLM service for testing.
+    Fixture providing a stub LLM service shared by the tests of a module.
+
+    The stub is reset before every test, so each test configures the return
+    value or side effect it needs.
+
+    Returns:
+        StubLLM: A stub LLM service
+    """
+    return stub_llm()
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_llm_service(mock_llm_service):
+    mock_llm_service.reset()
+
+
+@pytest.fixture(scope="module")
+def uncached_config():
+    """
+    Fixture providing the default configuration with response caching disabled.
+
+    Services shared between tests must not serve one test's results to another.
+
+    Returns:
+        Dict[str, Any]: The configuration
+    """
+    return dict(get_default_config(), response_cache_size=0)
+
+
+@pytest.fixture(scope="module")
+def quiz_service(mock_llm_service, uncached_config):
+    """
+    Fixture providing a quiz service backed by the shared stub LLM service.
+
+    Returns:
+        QuizService: The quiz service
+    """
+    return QuizService(mock_llm_service, config=uncached_config)
+
+
+@pytest.fixture(scope="module")
+def roadmap_service(mock_llm_service, uncached_config):
+    """
+    Fixture providing a roadmap service backed by the shared stub LLM service.
 
     Returns:
-        MagicMock: A mock LLM service
+        RoadmapService: The roadmap service
     """
-    mock_service = MagicMock(spec=LLMService)
-    mock_service.generate_content.return_value = "Sample generated content"
-    mock_service.generate_json_content.return_value = '{"key": "value"}'
-    return mock_service
+    return RoadmapService(mock_llm_service, config=uncached_config)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_learner():
     """
-    Fixture providing a sample learner profile for testing.
+    Fixture providing a learner profile shared by the whole test session.
 
     Returns:
         LearnerProfile: A sample learner profile
     """
-    return LearnerProfile(
-        age=12,
-        grade_level=6,
-        learning_style="visual",
-        known_topics=["fractions"],
-        struggles=["decimals", "percentages"],
-        goal="master converting between decimals and fractions",
-    )
+    return _PROFILE
+
+
+@pytest.fixture(scope="session")
+def sample_quiz_json():
+    """
+    Fixture providing the raw bytes of a sample quiz response.
+
+    Returns:
+        bytes: The JSON response body
+    """
+    return (FIXTURES / "quiz.json").read_bytes()
+
+
+@pytest.fixture(scope="session")
+def sample_quiz_response(sample_quiz_json):
+    """
+    Fixture providing a sample quiz response, decoded once per session with the
+    same decoder (orjson when installed) that LLMService uses.
+
+    Returns:
+        Dict[str, Any]: The decoded response
+    """
+    return _json_loads(sample_quiz_json)
+
+
+@pytest.fixture(scope="session")
+def sample_roadmap_json():
+    """
+    Fixture providing the raw bytes of a sample roadmap response.
+
+    Returns:
+        bytes: The JSON response body
+    """
+    return (FIXTURES / "roadmap.json").read_bytes()
+
+
+@pytest.fixture(scope="session")
+def sample_llm_response(sample_roadmap_json):
+    """
+    Fixture providing a sample roadmap response, decoded once per session with
+    the same decoder (orjson when installed) that LLMService uses.
+
+    Returns:
+        Dict[str, Any]: The decoded response
+    """
+    return _json_loads(sample_roadmap_json)
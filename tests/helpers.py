@@ -0,0 +1,128 @@
+"""
+Test helpers for the seek_core package tests.
+
+This module provides a lightweight stand-in for LLMService, so that tests
+don't pay for building spec'd mocks of the real class.
+"""
+
+import re
+from typing import Any, List, Optional
+from unittest.mock import call
+
+# Marks the placeholder content the services return when generation fails
+PLACEHOLDER_RE = re.compile(r"placeholder", re.IGNORECASE)
+
+
+class StubCall:
+    """
+    A stubbed method that records its calls and returns a canned result.
+
+    Attributes:
+        return_value (Any): The value returned by each call
+        side_effect (Optional[BaseException]): An exception raised by each call instead
+        call_count (int): The number of calls made so far
+        call_args_list (List[Any]): The arguments of each call, in order
+    """
+
+    def __init__(
+        self, return_value: Any = None, side_effect: Optional[BaseException] = None
+    ):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.call_count = 0
+        self.call_args_list: List[Any] = []
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.call_count += 1
+        self.call_args_list.append(call(*args, **kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+    @property
+    def call_args(self) -> Optional[Any]:
+        """The arguments of the most recent call, or None if there were none."""
+        return self.call_args_list[-1] if self.call_args_list else None
+
+    def assert_called_once(self) -> None:
+        """Assert that the stub was called exactly once."""
+        assert self.call_count == 1, f"Expected 1 call, got {self.call_count}"
+
+    def reset(self) -> None:
+        """Forget all recorded calls and the configured result."""
+        self.return_value = None
+        self.side_effect = None
+        self.call_count = 0
+        self.call_args_list = []
+
+
+class AsyncStubCall(StubCall):
+    """A StubCall for coroutine methods, returning its result when awaited."""
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return super().__call__(*args, **kwargs)
+
+
+class StubLLM:
+    """
+    A stand-in for LLMService with its generation methods stubbed.
+
+    Each method is a StubCall sharing the same return value and side effect;
+    they can be configured individually after construction.
+    """
+
+    def __init__(
+        self, return_value: Any = None, side_effect: Optional[BaseException] = None
+    ):
+        self.generate_content = StubCall(return_value, side_effect)
+        self.generate_json_content = StubCall(return_value, side_effect)
+        self.stream_content = StubCall(return_value, side_effect)
+        self.stream_json_content = StubCall(return_value, side_effect)
+        self.agenerate_content = AsyncStubCall(return_value, side_effect)
+        self.agenerate_json_content = AsyncStubCall(return_value, side_effect)
+
+    def __reduce__(self):
+        # Pickle as a fresh stub; each pytest-xdist worker configures its own
+        return (StubLLM, ())
+
+    def reset(self) -> None:
+        """Restore every stubbed method to its unconfigured, uncalled state."""
+        self.generate_content.reset()
+        self.generate_json_content.reset()
+        self.stream_content.reset()
+        self.stream_json_content.reset()
+        self.agenerate_content.reset()
+        self.agenerate_json_content.reset()
+
+
+def stub_llm(
+    return_value: Any = None, side_effect: Optional[BaseException] = None
+) -> StubLLM:
+    """
+    Build a stub LLM service.
+
+    Args:
+        return_value (Any): The value returned by the generation methods
+        side_effect (Optional[BaseException]): An exception raised by the generation methods
+
+    Returns:
+        StubLLM: The stub LLM service
+    """
+    return StubLLM(return_value=return_value, side_effect=side_effect)
+
+
+def assert_calls_between(stub: StubCall, lo: int, hi: int) -> None:
+    """
+    Assert that a stub was called a number of times within a range.
+
+    Success tests use this rather than assert_called_once, so that caching or
+    request coalescing can change the exact count by adjusting the bounds.
+
+    Args:
+        stub (StubCall): The stubbed method
+        lo (int): The minimum number of calls
+        hi (int): The maximum number of calls
+    """
+    assert (
+        lo <= stub.call_count <= hi
+    ), f"Expected between {lo} and {hi} calls, got {stub.call_count}"
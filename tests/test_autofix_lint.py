@@ -0,0 +1,30 @@
+"""
+Tests for the autofix lint script.
+
+This module contains tests that verify the whitespace fixing of the
+autofix_lint maintenance script.
+"""
+
+from scripts import autofix_lint
+
+
+class TestFixNewlinesAndWhitespace:
+    """Tests for the fix_newlines_and_whitespace function."""
+
+    def test_strips_trailing_whitespace(self, tmp_path):
+        """Test that trailing whitespace and extra final newlines are removed."""
+        path = tmp_path / "module.py"
+        path.write_bytes(b"x = 1   \n\t\ny = 2\t\n\n\n")
+
+        autofix_lint.fix_newlines_and_whitespace(path)
+
+        assert path.read_bytes() == b"x = 1\n\ny = 2\n"
+
+    def test_strips_trailing_whitespace_before_crlf(self, tmp_path):
+        """Test that CRLF line endings are kept while their whitespace is removed."""
+        path = tmp_path / "module.py"
+        path.write_bytes(b"x = 1   \r\n\t\r\ny = 2\t\r\n")
+
+        autofix_lint.fix_newlines_and_whitespace(path)
+
+        assert path.read_bytes() == b"x = 1\r\n\r\ny = 2\r\n"
@@ -0,0 +1,137 @@
+"""
+Tests for the LLM response caches.
+
+This module contains tests that verify the functionality of the
+response caching component of the seek-core package.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from seek_core.llm.cache import ResponseCache, SemanticCache
+from seek_core.llm.openai_service import LLMService
+from seek_core.services.explanation_service import ExplanationService
+
+
+@pytest.fixture
+def llm_service():
+    service = LLMService(api_key="test-key", model="test-model")
+    service.client = MagicMock()
+    completion = service.client.chat.completions.create.return_value
+    completion.choices[0].message.content = "Generated content"
+    yield service
+    # The mocked client doesn't own the real connection pool, so close it here
+    service._http.close()
+
+
+class TestResponseCache:
+    """Tests for the ResponseCache class."""
+
+    def test_get_and_set(self):
+        """Test that stored responses are returned for the same key."""
+        cache = ResponseCache()
+        key = ResponseCache.make_key("model", "system", "prompt", 0.7)
+
+        assert cache.get(key) is None
+        cache.set(key, "response")
+        assert cache.get(key) == "response"
+
+    def test_make_key_distinguishes_parts(self):
+        """Test that keys differ when any of the parts differ."""
+        assert ResponseCache.make_key("a", "bc") != ResponseCache.make_key("ab", "c")
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest entry is evicted when the cache is full."""
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_persists_to_disk(self, tmp_path):
+        """Test that entries survive reopening a shelve-backed cache."""
+        path = str(tmp_path / "responses")
+        cache = ResponseCache(path=path)
+        cache.set("key", "response")
+        cache.close()
+
+        assert ResponseCache(path=path).get("key") == "response"
+
+
+class TestSemanticCache:
+    """Tests for the SemanticCache class."""
+
+    def test_similar_embedding_hits(self):
+        """Test that a close embedding returns the cached response."""
+        cache = SemanticCache(threshold=0.97)
+        cache.set("ns", [1.0, 0.0, 0.0], "response")
+
+        assert cache.get("ns", [0.99, 0.05, 0.0]) == "response"
+
+    def test_dissimilar_embedding_misses(self):
+        """Test that a distant embedding or other namespace misses."""
+        cache = SemanticCache(threshold=0.97)
+        cache.set("ns", [1.0, 0.0, 0.0], "response")
+
+        assert cache.get("ns", [0.0, 1.0, 0.0]) is None
+        assert cache.get("other", [1.0, 0.0, 0.0]) is None
+
+
+class TestLLMServiceCaching:
+    """Tests for response caching in the LLMService class."""
+
+    def test_cache_hit_skips_api_call(self, llm_service):
+        """Test that a repeated prompt is served from the exact-match cache."""
+        llm_service.cache = ResponseCache()
+
+        first = llm_service.generate_content("prompt", "system")
+        second = llm_service.generate_content("prompt", "system")
+
+        assert first == second == "Generated content"
+        llm_service.client.chat.completions.create.assert_called_once()
+
+    def test_semantic_cache_hit_skips_api_call(self, llm_service):
+        """Test that a near-duplicate prompt is served from the semantic cache."""
+        llm_service.semantic_cache = SemanticCache(threshold=0.97)
+        llm_service.embed = MagicMock(side_effect=[[1.0, 0.0], [0.99, 0.01]])
+
+        llm_service.generate_content("prompt", "system")
+        content = llm_service.generate_content("similar prompt", "system")
+
+        assert content == "Generated content"
+        llm_service.client.chat.completions.create.assert_called_once()
+
+    def test_semantic_cache_separates_learners(self, llm_service, sample_learner):
+        """Test that learners differing only in grade don't share content."""
+        llm_service.semantic_cache = SemanticCache(threshold=0.97)
+        # Identical embeddings, as the learners' goals are the same
+        llm_service.embed = MagicMock(return_value=[1.0, 0.0])
+        explanation_service = ExplanationService(llm_service)
+        older_learner = sample_learner.model_copy(update={"grade_level": 9})
+
+        explanation_service.generate_explanation(sample_learner)
+        explanation_service.generate_explanation(older_learner)
+
+        assert llm_service.client.chat.completions.create.call_count == 2
+        assert llm_service.embed.call_args.args == (sample_learner.goal,)
+
+    def test_semantic_cache_reuses_content_for_same_details(
+        self, llm_service, sample_learner
+    ):
+        """Test that a reworded goal with identical details is a cache hit."""
+        llm_service.semantic_cache = SemanticCache(threshold=0.97)
+        llm_service.embed = MagicMock(side_effect=[[1.0, 0.0], [0.99, 0.01]])
+        explanation_service = ExplanationService(llm_service)
+        reworded_learner = sample_learner.model_copy(
+            update={"goal": "convert between decimals and fractions"}
+        )
+
+        explanation_service.generate_explanation(sample_learner)
+        explanation_service.generate_explanation(reworded_learner)
+
+        llm_service.client.chat.completions.create.assert_called_once()
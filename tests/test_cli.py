@@ -0,0 +1,74 @@
+"""
+Tests for the command-line interface.
+
+This module contains tests that verify the argument parsing of the
+seek-core command-line script.
+"""
+
+import pytest
+
+import cli
+
+ARGV = [
+    "--age",
+    "12",
+    "--grade-level",
+    "6",
+    "--learning-style",
+    "visual",
+    "--struggles",
+    "decimals,percentages",
+    "--goal",
+    "master converting between decimals and fractions",
+    "--pretty",
+]
+
+
+class TestParseArgs:
+    """Tests for the parse_args function."""
+
+    def test_fast_path_matches_argparse(self):
+        """Test that the fast path produces the same namespace as argparse."""
+        fast = cli._fast_parse_args(ARGV)
+
+        # An "=" in a flag isn't handled by the fast path, forcing argparse
+        slow = cli.parse_args(["--output=plan.json"] + ARGV)
+        slow.output = None
+
+        assert fast is not None
+        assert vars(fast) == vars(slow)
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--help"],
+            ARGV + ["--unknown", "x"],
+            ARGV[2:],
+            ["--age", "twelve"] + ARGV[2:],
+        ],
+    )
+    def test_falls_back_to_argparse(self, argv):
+        """Test that help, unknown flags and invalid values use argparse."""
+        assert cli._fast_parse_args(argv) is None
+
+    def test_argparse_reports_errors(self):
+        """Test that invalid arguments still exit with an argparse error."""
+        with pytest.raises(SystemExit):
+            cli.parse_args(["--age", "twelve"] + ARGV[2:])
+
+
+class TestSplitList:
+    """Tests for the split_list function."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("", []),
+            ("fractions", ["fractions"]),
+            (" decimals , percentages ", ["decimals", "percentages"]),
+            ("a, b, ,", ["a", "b"]),
+        ],
+    )
+    def test_split_list(self, value, expected):
+        """Test that items are stripped and empty entries are dropped."""
+        assert cli.split_list(value) == expected
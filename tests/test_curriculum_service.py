@@ -0,0 +1,93 @@
+"""
+Tests for the curriculum service.
+
+This module contains tests that verify the functionality of the
+curriculum service component of the seek-core package.
+"""
+
+import pytest
+
+from seek_core.models.schemas import MicroLesson, QuizQuestion
+from seek_core.services.curriculum_service import CurriculumService
+from tests.helpers import PLACEHOLDER_RE
+
+_LESSON = {
+    "title": "Converting Simple Fractions to Decimals",
+    "description": "Practice converting basic fractions to their decimal equivalents",
+    "estimated_time_minutes": 12,
+    "content": "Divide the numerator by the denominator to turn a fraction into a decimal.",
+}
+
+_QUESTION = {
+    "question": "Which of the following is equal to 1/4 as a decimal?",
+    "options": ["A. 0.25", "B. 0.4", "C. 0.75", "D. 0.125"],
+    "correct_answer_index": 0,
+    "explanation": "To convert 1/4 to a decimal, divide 1 by 4, which gives 0.25.",
+}
+
+
+# A curriculum service backed by the shared stub LLM service
+@pytest.fixture(scope="module")
+def curriculum_service(mock_llm_service, uncached_config):
+    return CurriculumService(mock_llm_service, config=uncached_config)
+
+
+class TestCurriculumService:
+    """Tests for the CurriculumService class."""
+
+    def test_generate_curriculum_makes_one_request(
+        self, curriculum_service, mock_llm_service, sample_learner
+    ):
+        """Test that the roadmap and quiz come back from a single LLM call."""
+        mock_llm_service.generate_json_content.return_value = {
+            "lessons": [_LESSON] * 3,
+            "questions": [_QUESTION] * 3,
+        }
+
+        roadmap, quiz = curriculum_service.generate_curriculum(sample_learner)
+
+        assert mock_llm_service.generate_json_content.call_count == 1
+        assert roadmap == [MicroLesson(**_LESSON)] * 3
+        assert quiz == [QuizQuestion(**_QUESTION)] * 3
+
+    def test_generate_curriculum_error_handling(
+        self, curriculum_service, mock_llm_service, sample_learner
+    ):
+        """Test that a failed request falls back to placeholder content."""
+        mock_llm_service.generate_json_content.side_effect = Exception("API error")
+
+        roadmap, quiz = curriculum_service.generate_curriculum(sample_learner)
+
+        assert PLACEHOLDER_RE.search(roadmap[0].content)
+        assert PLACEHOLDER_RE.search(quiz[0].explanation)
+
+    def test_curriculum_token_budget_covers_both_artifacts(
+        self, curriculum_service, mock_llm_service, sample_learner
+    ):
+        """Test that the request may use the roadmap and quiz budgets combined."""
+        mock_llm_service.generate_json_content.return_value = {
+            "lessons": [_LESSON] * 3,
+            "questions": [_QUESTION] * 3,
+        }
+        config = curriculum_service.config
+
+        curriculum_service.generate_curriculum(sample_learner)
+
+        kwargs = mock_llm_service.generate_json_content.call_args.kwargs
+        assert kwargs["max_tokens"] == (
+            config["roadmap_max_tokens"] + config["quiz_max_tokens"]
+        )
+
+    def test_curriculum_uses_main_model(
+        self, curriculum_service, mock_llm_service, sample_learner
+    ):
+        """Test that the combined request does not switch to the quiz model."""
+        mock_llm_service.generate_json_content.return_value = {
+            "lessons": [_LESSON] * 3,
+            "questions": [_QUESTION] * 3,
+        }
+
+        curriculum_service.generate_curriculum(sample_learner)
+
+        kwargs = mock_llm_service.generate_json_content.call_args.kwargs
+        assert "model" not in kwargs
@@ -0,0 +1,42 @@
+"""
+Tests for incremental JSON stream decoding.
+
+This module contains tests that verify the functionality of the
+json_stream helpers of the seek-core package.
+"""
+
+import json
+
+import pytest
+
+from seek_core.llm.json_stream import iter_array_items
+
+_DOCUMENT = json.dumps(
+    {
+        "title": "ignored [not the array]",
+        "questions": [{"id": 1, "text": "a } b"}, {"id": 2, "text": "c ] d"}],
+    },
+    indent=2,
+)
+
+
+class TestIterArrayItems:
+    """Tests for the iter_array_items function."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, len(_DOCUMENT)])
+    def test_decodes_items_across_chunk_boundaries(self, chunk_size):
+        """Test that items are decoded however the document is split."""
+        chunks = [
+            _DOCUMENT[i : i + chunk_size] for i in range(0, len(_DOCUMENT), chunk_size)
+        ]
+
+        items = list(iter_array_items(chunks, "questions"))
+
+        assert items == json.loads(_DOCUMENT)["questions"]
+
+    def test_truncated_document_raises(self):
+        """Test that a stream ending inside the array is reported."""
+        truncated = _DOCUMENT[: _DOCUMENT.index('"id": 2')]
+
+        with pytest.raises(ValueError):
+            list(iter_array_items([truncated], "questions"))
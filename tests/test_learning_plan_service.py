@@ -5,8 +5,12 @@ This module contains tests that verify the functionality of the
 learning plan service component of the seek-core package.
 """
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
+from seek_core.config import get_default_config
 from seek_core.models.schemas import LearnerProfile, MicroLesson, QuizQuestion
 from seek_core.services.explanation_service import ExplanationService
 from seek_core.services.learning_plan_service import LearningPlanService
@@ -139,3 +143,236 @@ class TestLearningPlanService:
 
         # Check that no resource link is provided
         assert learning_plan.resource_link is None
+
+    @patch("seek_core.services.learning_plan_service.RoadmapService")
+    @patch("seek_core.services.learning_plan_service.QuizService")
+    @patch("seek_core.services.learning_plan_service.ExplanationService")
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_agenerate_learning_plan(
+        self,
+        mock_llm_cls,
+        mock_exp_cls,
+        mock_quiz_cls,
+        mock_roadmap_cls,
+        sample_learner,
+    ):
+        """Test that the async learning plan awaits all component services."""
+        # Set up the mock services
+        mock_roadmap_service = MagicMock(spec=RoadmapService)
+        mock_quiz_service = MagicMock(spec=QuizService)
+        mock_explanation_service = MagicMock(spec=ExplanationService)
+
+        # Set up the return values for the async component methods
+        mock_roadmap_service.agenerate_roadmap = AsyncMock(return_value=[])
+        mock_quiz_service.agenerate_quiz = AsyncMock(return_value=[])
+        mock_explanation_service.agenerate_explanation = AsyncMock(
+            return_value="Test explanation"
+        )
+        mock_explanation_service.generate_resource_link.return_value = (
+            "https://example.com/resource"
+        )
+
+        # Attach the mock services to the mock classes
+        mock_roadmap_cls.return_value = mock_roadmap_service
+        mock_quiz_cls.return_value = mock_quiz_service
+        mock_exp_cls.return_value = mock_explanation_service
+
+        # Generate a learning plan
+        service = LearningPlanService()
+        learning_plan = asyncio.run(service.agenerate_learning_plan(sample_learner))
+
+        # Check that all component services were awaited
+        mock_roadmap_service.agenerate_roadmap.assert_awaited_once_with(sample_learner)
+        mock_quiz_service.agenerate_quiz.assert_awaited_once_with(sample_learner)
+        mock_explanation_service.agenerate_explanation.assert_awaited_once_with(
+            sample_learner
+        )
+        assert learning_plan.personalized_explanation == "Test explanation"
+        assert learning_plan.resource_link == "https://example.com/resource"
+
+    @patch("seek_core.services.learning_plan_service.RoadmapService")
+    @patch("seek_core.services.learning_plan_service.QuizService")
+    @patch("seek_core.services.learning_plan_service.ExplanationService")
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_agenerate_learning_plan_error(
+        self,
+        mock_llm_cls,
+        mock_exp_cls,
+        mock_quiz_cls,
+        mock_roadmap_cls,
+        sample_learner,
+    ):
+        """Test that a failing component is re-raised after all calls finish."""
+        mock_roadmap_service = MagicMock(spec=RoadmapService)
+        mock_quiz_service = MagicMock(spec=QuizService)
+        mock_explanation_service = MagicMock(spec=ExplanationService)
+
+        mock_roadmap_service.agenerate_roadmap = AsyncMock(
+            side_effect=RuntimeError("API error")
+        )
+        mock_quiz_service.agenerate_quiz = AsyncMock(return_value=[])
+        mock_explanation_service.agenerate_explanation = AsyncMock(return_value="")
+
+        mock_roadmap_cls.return_value = mock_roadmap_service
+        mock_quiz_cls.return_value = mock_quiz_service
+        mock_exp_cls.return_value = mock_explanation_service
+
+        service = LearningPlanService()
+        with pytest.raises(RuntimeError, match="API error"):
+            asyncio.run(service.agenerate_learning_plan(sample_learner))
+
+        mock_quiz_service.agenerate_quiz.assert_awaited_once_with(sample_learner)
+        mock_explanation_service.agenerate_explanation.assert_awaited_once_with(
+            sample_learner
+        )
+
+    @patch("seek_core.services.learning_plan_service.RoadmapService")
+    @patch("seek_core.services.learning_plan_service.QuizService")
+    @patch("seek_core.services.learning_plan_service.ExplanationService")
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_plan_cache_reuses_similar_plans(
+        self,
+        mock_llm_cls,
+        mock_exp_cls,
+        mock_quiz_cls,
+        mock_roadmap_cls,
+        sample_learner,
+    ):
+        """Test that a similar learner is served the cached learning plan."""
+        mock_llm_cls.shared.return_value.embed.side_effect = [[1.0, 0.0], [0.99, 0.05]]
+        mock_roadmap_cls.return_value.generate_roadmap.return_value = []
+        mock_quiz_cls.return_value.generate_quiz.return_value = []
+        mock_exp_cls.return_value.generate_explanation.return_value = "Explanation"
+
+        config = dict(get_default_config(), plan_cache_enabled=True)
+        service = LearningPlanService(config=config)
+        similar_learner = sample_learner.model_copy(
+            update={"goal": "learn to convert fractions to decimals"}
+        )
+
+        first = service.generate_learning_plan(sample_learner)
+        second = service.generate_learning_plan(similar_learner)
+
+        assert second is first
+        mock_roadmap_cls.return_value.generate_roadmap.assert_called_once()
+        embedded_text = mock_llm_cls.shared.return_value.embed.call_args_list[0].args[0]
+        assert embedded_text.startswith(sample_learner.goal)
+
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_plan_cache_skips_fallback_plans(
+        self, mock_llm_cls, sample_learner, sample_quiz_response
+    ):
+        """Test that a plan holding placeholder content is not reused."""
+        mock_llm = mock_llm_cls.shared.return_value
+        mock_llm.embed.side_effect = [[1.0, 0.0], [0.99, 0.05]]
+        mock_llm.generate_content.return_value = "Explanation"
+
+        def generate_json_content(prompt, system_prompt, schema, **kwargs):
+            if schema["title"] == "roadmap":
+                raise RuntimeError("API error")
+            return sample_quiz_response
+
+        mock_llm.generate_json_content.side_effect = generate_json_content
+
+        config = dict(
+            get_default_config(), plan_cache_enabled=True, response_cache_size=0
+        )
+        service = LearningPlanService(config=config)
+        similar_learner = sample_learner.model_copy(
+            update={"goal": "learn to convert fractions to decimals"}
+        )
+
+        service.generate_learning_plan(sample_learner)
+        service.generate_learning_plan(similar_learner)
+
+        assert mock_llm.generate_json_content.call_count == 4
+        assert mock_llm.generate_content.call_count == 2
+
+    @patch("seek_core.services.learning_plan_service.RoadmapService")
+    @patch("seek_core.services.learning_plan_service.QuizService")
+    @patch("seek_core.services.learning_plan_service.ExplanationService")
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_agenerate_learning_plan_stream(
+        self,
+        mock_llm_cls,
+        mock_exp_cls,
+        mock_quiz_cls,
+        mock_roadmap_cls,
+        sample_learner,
+    ):
+        """Test that explanation pieces and components stream before the plan."""
+
+        async def explanation_stream(learner):
+            for part in ["Fractions ", "are ", "parts."]:
+                yield part
+
+        mock_roadmap_cls.return_value.agenerate_roadmap = AsyncMock(return_value=[])
+        mock_quiz_cls.return_value.agenerate_quiz = AsyncMock(return_value=[])
+        mock_exp_cls.return_value.agenerate_explanation_stream = explanation_stream
+        mock_exp_cls.return_value.generate_resource_link.return_value = None
+
+        service = LearningPlanService()
+
+        async def collect():
+            return [
+                event
+                async for event in service.agenerate_learning_plan_stream(
+                    sample_learner
+                )
+            ]
+
+        events = asyncio.run(collect())
+        kinds = [kind for kind, _ in events]
+
+        assert kinds.count("explanation") == 3
+        assert {"roadmap", "quiz"} <= set(kinds)
+        assert kinds[-1] == "plan"
+        assert events[-1][1].personalized_explanation == "Fractions are parts."
+
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_agenerate_learning_plans_limits_concurrency(
+        self, mock_llm_cls, sample_learner
+    ):
+        """Test that batch generation keeps order and the concurrency limit."""
+        config = dict(get_default_config(), plan_concurrency=2)
+        service = LearningPlanService(config=config)
+        learners = [
+            sample_learner.model_copy(update={"goal": "goal %d" % i}) for i in range(5)
+        ]
+        running = []
+        peak = []
+
+        async def fake_plan(learner):
+            running.append(learner)
+            peak.append(len(running))
+            await asyncio.sleep(0)
+            running.remove(learner)
+            return learner.goal
+
+        service.agenerate_learning_plan = fake_plan
+
+        plans = asyncio.run(service.agenerate_learning_plans(learners))
+
+        assert plans == ["goal %d" % i for i in range(5)]
+        assert max(peak) == 2
+
+    @patch("seek_core.services.learning_plan_service.LLMService")
+    def test_prefetch_warms_component_caches(self, mock_llm_cls, sample_learner):
+        """Test that a prefetched plan is later served without calling the API."""
+        llm_service = mock_llm_cls.shared.return_value
+        llm_service.generate_json_content.return_value = {
+            "lessons": [],
+            "questions": [],
+        }
+        llm_service.generate_content.return_value = "Explanation"
+
+        service = LearningPlanService()
+        futures = service.prefetch_learning_plans([sample_learner])
+        prefetched = futures[0].result()
+        service.shutdown_prefetch()
+        calls = llm_service.generate_json_content.call_count
+
+        plan = service.generate_learning_plan(sample_learner)
+
+        assert plan == prefetched
+        assert llm_service.generate_json_content.call_count == calls
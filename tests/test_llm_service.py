@@ -0,0 +1,223 @@
+"""
+Tests for the LLM service.
+
+This module contains tests that verify the functionality of the
+OpenAI integration component of the seek-core package.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from seek_core.llm import openai_service
+from seek_core.llm.cache import ResponseCache
+from seek_core.llm.openai_service import LLMService
+
+
+class _FakeStream(list):
+    """A list of streamed chunks that records whether it was closed."""
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeAsyncStream(_FakeStream):
+    """A _FakeStream iterated and closed like the async client's stream."""
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def _stream_chunks(*parts):
+    """Build fake streamed completion chunks carrying the given text parts."""
+    return _FakeStream(
+        SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=part, refusal=None))]
+        )
+        for part in parts
+    )
+
+
+@pytest.fixture
+def llm_service():
+    service = LLMService(api_key="test-key", model="test-model")
+    service.client = MagicMock()
+    yield service
+    # The mocked client doesn't own the real connection pool, so close it here
+    service._http.close()
+
+
+class TestLLMService:
+    """Tests for the LLMService class."""
+
+    def test_generate_json_content_decodes_stream(self, llm_service):
+        """Test that streamed JSON chunks are joined and decoded to a dict."""
+        llm_service.client.chat.completions.create.return_value = _stream_chunks(
+            '{"lessons": [', '{"title": "Fractions"}', "]}", None
+        )
+
+        data = llm_service.generate_json_content("prompt", "system")
+
+        assert data == {"lessons": [{"title": "Fractions"}]}
+        kwargs = llm_service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    def test_generate_json_content_with_schema(self, llm_service):
+        """Test that a schema is sent as a strict structured-output format."""
+        llm_service.client.chat.completions.create.return_value = _stream_chunks(
+            '{"lessons": []}'
+        )
+        schema = {"title": "roadmap", "type": "object"}
+
+        llm_service.generate_json_content("prompt", "system", schema=schema)
+
+        kwargs = llm_service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {
+            "type": "json_schema",
+            "json_schema": {"name": "roadmap", "schema": schema, "strict": True},
+        }
+
+    def test_generate_json_content_max_tokens_override(self, llm_service):
+        """Test that a per-call token limit replaces the configured one."""
+        llm_service.client.chat.completions.create.return_value = _stream_chunks("{}")
+
+        llm_service.generate_json_content("prompt", "system", max_tokens=1500)
+
+        kwargs = llm_service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 1500
+
+    def test_generate_json_content_invalid_json(self, llm_service):
+        """Test that an invalid JSON response raises an error."""
+        llm_service.client.chat.completions.create.return_value = _stream_chunks(
+            "not json"
+        )
+
+        with pytest.raises(ValueError):
+            llm_service.generate_json_content("prompt", "system")
+
+    def test_stream_content_yields_and_caches(self, llm_service):
+        """Test that streamed text is yielded piecewise and cached when complete."""
+        llm_service.cache = ResponseCache()
+        llm_service.client.chat.completions.create.return_value = _stream_chunks(
+            "Fractions ", "are ", None, "parts."
+        )
+
+        parts = list(llm_service.stream_content("prompt", "system"))
+        cached = list(llm_service.stream_content("prompt", "system"))
+
+        assert parts == ["Fractions ", "are ", "parts."]
+        assert cached == ["Fractions are parts."]
+        llm_service.client.chat.completions.create.assert_called_once()
+
+    def test_stream_content_closes_stream_when_stopped_early(self, llm_service):
+        """Test that breaking out of the text stream closes the response."""
+        llm_service.cache = ResponseCache()
+        stream = _stream_chunks("Fractions ", "are ", "parts.")
+        llm_service.client.chat.completions.create.return_value = stream
+
+        for _ in llm_service.stream_content("prompt", "system"):
+            break
+
+        assert stream.closed
+        assert len(llm_service.cache) == 0
+
+    def test_astream_content_closes_stream_when_stopped_early(self, llm_service):
+        """Test that abandoning the async text stream closes the response."""
+        llm_service.cache = ResponseCache()
+        stream = _FakeAsyncStream(_stream_chunks("Fractions ", "are ", "parts."))
+        llm_service._async_client = MagicMock()
+        llm_service._async_client.chat.completions.create = AsyncMock(
+            return_value=stream
+        )
+
+        async def read_first_part():
+            parts = llm_service.astream_content("prompt", "system")
+            await parts.__anext__()
+            await parts.aclose()
+
+        asyncio.run(read_first_part())
+
+        assert stream.closed
+        assert len(llm_service.cache) == 0
+
+    def test_stream_json_content_shares_cache_with_generate(self, llm_service):
+        """Test that streamed JSON is cached for generate_json_content."""
+        llm_service.cache = ResponseCache()
+        llm_service.client.chat.completions.create.return_value = _stream_chunks(
+            '{"questions":', None, "[]}"
+        )
+
+        parts = list(llm_service.stream_json_content("prompt", "system"))
+        data = llm_service.generate_json_content("prompt", "system")
+
+        assert parts == ['{"questions":', "[]}"]
+        assert data == {"questions": []}
+        kwargs = llm_service.client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+        llm_service.client.chat.completions.create.assert_called_once()
+
+    def test_stream_json_content_does_not_cache_incomplete_json(self, llm_service):
+        """Test that a truncated stream is not served to generate_json_content."""
+        llm_service.cache = ResponseCache()
+        create = llm_service.client.chat.completions.create
+        create.side_effect = [
+            _stream_chunks('{"questions":', "[{"),
+            _stream_chunks('{"questions":', "[]}"),
+        ]
+
+        list(llm_service.stream_json_content("prompt", "system"))
+        data = llm_service.generate_json_content("prompt", "system")
+
+        assert data == {"questions": []}
+        assert create.call_count == 2
+
+    def test_stream_json_content_closes_stream_when_stopped_early(self, llm_service):
+        """Test that abandoning the iterator closes the underlying stream."""
+        llm_service.cache = ResponseCache()
+        stream = _stream_chunks('{"questions":', "[]}")
+        llm_service.client.chat.completions.create.return_value = stream
+
+        parts = llm_service.stream_json_content("prompt", "system")
+        next(parts)
+        parts.close()
+
+        assert stream.closed
+        assert len(llm_service.cache) == 0
+
+    def test_uses_pooled_http_client(self):
+        """Test that the OpenAI client is built on the service's httpx client."""
+        with LLMService(api_key="test-key", model="test-model") as service:
+            assert isinstance(service._http, httpx.Client)
+            assert service.client._client is service._http
+
+        assert service._http.is_closed
+
+    def test_configures_retries(self):
+        """Test that the OpenAI client retries transient errors."""
+        with LLMService(api_key="test-key", model="test-model") as service:
+            assert service.client.max_retries == 4
+
+    def test_shared_reuses_instances(self, monkeypatch):
+        """Test that shared services are reused per API key and model."""
+        monkeypatch.setattr(openai_service, "_SHARED", {})
+
+        first = LLMService.shared(api_key="test-key", model="test-model")
+        second = LLMService.shared(api_key="test-key", model="test-model")
+        other = LLMService.shared(api_key="test-key", model="other-model")
+
+        assert second is first
+        assert other is not first
+
+        # The registry is local to this test, so the test owns its instances
+        for service in openai_service._SHARED.values():
+            service.close()
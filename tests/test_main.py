@@ -0,0 +1,94 @@
+"""
+Tests for the package entry point.
+
+This module contains tests that verify the behavior of the
+generate_learning_plan entry point of the seek-core package.
+"""
+
+import json
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import seek_core.__main__ as entry_point
+from seek_core.models.schemas import LearningPlanResponse, MicroLesson
+
+
+@pytest.fixture(autouse=True)
+def clear_service_cache():
+    entry_point._SERVICE_CACHE.clear()
+    yield
+    entry_point._SERVICE_CACHE.clear()
+
+
+class TestGetService:
+    """Tests for the cached learning plan service lookup."""
+
+    @patch("seek_core.__main__.LearningPlanService")
+    def test_service_reused_for_same_key(self, mock_service_cls):
+        """Test that repeated lookups reuse a single service instance."""
+        first = entry_point._get_service(api_key="key", model="model")
+        second = entry_point._get_service(api_key="key", model="model")
+
+        assert first is second
+        mock_service_cls.assert_called_once_with(api_key="key", model="model")
+
+    @patch("seek_core.__main__.LearningPlanService")
+    def test_service_per_model(self, mock_service_cls):
+        """Test that different models get different service instances."""
+        entry_point._get_service(api_key="key", model="model-a")
+        entry_point._get_service(api_key="key", model="model-b")
+
+        assert mock_service_cls.call_count == 2
+
+
+class TestGenerateLearningPlanJson:
+    """Tests for the JSON-returning entry point."""
+
+    @patch("seek_core.__main__._get_service")
+    def test_returns_json_bytes(self, mock_get_service, sample_learner):
+        """Test that the plan is returned as an encoded JSON document."""
+        plan = LearningPlanResponse(
+            roadmap=[
+                MicroLesson(
+                    title="Lesson",
+                    description="Description",
+                    estimated_time_minutes=10,
+                    content="Content",
+                )
+            ],
+            quiz=[],
+            personalized_explanation="Explanation",
+        )
+        service = MagicMock()
+        service.generate_learning_plan.return_value = plan
+        mock_get_service.return_value = service
+
+        output = entry_point.generate_learning_plan_json(
+            sample_learner.model_dump(), pretty=True
+        )
+
+        assert isinstance(output, bytes)
+        assert json.loads(output) == plan.model_dump(mode="json")
+        assert output.startswith(b"{\n  ")
+
+
+class TestLazyImports:
+    """Tests for the lazily imported package entry points."""
+
+    def test_import_does_not_load_openai(self):
+        """Test that importing the models doesn't import the OpenAI SDK."""
+        code = "import sys, seek_core; assert 'openai' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_entry_points_resolve(self):
+        """Test that the entry points are available from the package."""
+        import seek_core
+
+        assert seek_core.generate_learning_plan is entry_point.generate_learning_plan
+        assert (
+            seek_core.generate_learning_plan_json
+            is entry_point.generate_learning_plan_json
+        )
@@ -5,84 +5,66 @@ This module contains tests that verify the functionality of the
 quiz service component of the seek-core package.
 """
 
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import patch
 
-import pytest
-
-from seek_core.llm.openai_service import LLMService
+from seek_core.config import get_default_config
 from seek_core.models.schemas import QuizQuestion
+from seek_core.services import quiz_service as quiz_module
 from seek_core.services.quiz_service import QuizService
-
-
-# Sample JSON response from LLM
-@pytest.fixture
-def sample_quiz_response():
-    return """
-    [
-        {
-            "question": "Which of the following is equal to 1/4 as a decimal?",
-            "options": ["A. 0.25", "B. 0.4", "C. 0.75", "D. 0.125"],
-            "correct_answer_index": 0,
-            "explanation": "To convert 1/4 to a decimal, divide 1 by 4. 1 ÷ 4 = 0.25"
-        },
-        {
-            "question": "What is 0.75 as a fraction in simplest form?",
-            "options": ["A. 3/4", "B. 75/100", "C. 7.5/10", "D. 7/10"],
-            "correct_answer_index": 0,
-            "explanation": "0.75 = 75/100, which simplifies to 3/4 when both are divided by 25."
-        },
-        {
-            "question": "Which decimal and fraction pair is NOT equivalent?",
-            "options": ["A. 0.5 and 1/2", "B. 0.33 and 1/3", "C. 0.25 and 1/4", "D. 0.2 and 1/5"],
-            "correct_answer_index": 1,
-            "explanation": "0.33 is not exactly equal to 1/3, which is 0.333... (a repeating decimal)."
-        }
-    ]
-    """
+from tests.helpers import PLACEHOLDER_RE, assert_calls_between, stub_llm
 
 
 class TestQuizService:
     """Tests for the QuizService class."""
 
-    def test_generate_quiz_success(self, sample_learner, sample_quiz_response):
+    def test_generate_quiz_success(
+        self, quiz_service, mock_llm_service, sample_learner, sample_quiz_response
+    ):
         """Test successful quiz generation."""
-        # Create a mock LLM service
-        mock_llm_service = MagicMock(spec=LLMService)
+        # Configure the shared stub LLM service
         mock_llm_service.generate_json_content.return_value = sample_quiz_response
 
-        # Create the quiz service with the mock LLM service
-        quiz_service = QuizService(mock_llm_service)
-
         # Generate a quiz
         quiz = quiz_service.generate_quiz(sample_learner)
 
         # Check that the LLM service was called
-        mock_llm_service.generate_json_content.assert_called_once()
+        assert_calls_between(mock_llm_service.generate_json_content, 1, 1)
 
         # Check that we got the expected number of questions
         assert len(quiz) == 3
 
-        # Check that each item is a QuizQuestion
-        for question in quiz:
-            assert isinstance(question, QuizQuestion)
+        # Check every question against the response it was built from
+        assert all(type(question) is QuizQuestion for question in quiz)
+        for question, expected in zip(quiz, sample_quiz_response["questions"]):
+            assert question.question == expected["question"]
+            assert question.options == expected["options"]
+            assert len(question.options) == 4
+            assert question.correct_answer_index == expected["correct_answer_index"]
+            assert question.explanation == expected["explanation"]
+
+    def test_generate_quiz_validates_questions_in_one_call(
+        self, quiz_service, mock_llm_service, sample_learner, sample_quiz_response
+    ):
+        """Test that all questions are validated by the shared TypeAdapter at once."""
+        mock_llm_service.generate_json_content.return_value = sample_quiz_response
 
-        # Check the content of the first question
-        assert (
-            "Which of the following is equal to 1/4 as a decimal?" in quiz[0].question
+        with patch.object(
+            quiz_module, "_QUIZ_ADAPTER", wraps=quiz_module._QUIZ_ADAPTER
+        ) as adapter:
+            quiz_service.generate_quiz(sample_learner)
+
+        adapter.validate_python.assert_called_once_with(
+            sample_quiz_response["questions"]
         )
-        assert len(quiz[0].options) == 4
-        assert quiz[0].correct_answer_index == 0
-        assert "divide" in quiz[0].explanation.lower()
 
-    def test_generate_quiz_error_handling(self, sample_learner):
+    def test_generate_quiz_error_handling(
+        self, quiz_service, mock_llm_service, sample_learner
+    ):
         """Test error handling during quiz generation."""
-        # Create a mock LLM service that raises an exception
-        mock_llm_service = MagicMock(spec=LLMService)
+        # Make the shared stub LLM service raise an exception
         mock_llm_service.generate_json_content.side_effect = Exception("API error")
 
-        # Create the quiz service with the mock LLM service
-        quiz_service = QuizService(mock_llm_service)
-
         # Generate a quiz
         quiz = quiz_service.generate_quiz(sample_learner)
 
@@ -90,8 +72,134 @@ class TestQuizService:
         assert len(quiz) == 3
 
         # Check that each item is a QuizQuestion
-        for question in quiz:
-            assert isinstance(question, QuizQuestion)
+        assert all(type(question) is QuizQuestion for question in quiz)
 
         # Check that the content indicates it's a fallback
-        assert "placeholder" in quiz[0].explanation.lower()
+        assert PLACEHOLDER_RE.search(quiz[0].explanation)
+
+    def test_fallback_quiz_reuses_prebuilt_questions(
+        self, quiz_service, mock_llm_service, sample_learner
+    ):
+        """Test that every fallback is a new list of the same frozen questions."""
+        mock_llm_service.generate_json_content.side_effect = Exception("API error")
+
+        first = quiz_service.generate_quiz(sample_learner)
+        second = quiz_service.generate_quiz(sample_learner)
+
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_agenerate_quiz_runs_concurrently(
+        self, quiz_service, mock_llm_service, sample_learner, sample_quiz_response
+    ):
+        """Test that quizzes for several learners can be awaited together."""
+        mock_llm_service.agenerate_json_content.return_value = sample_quiz_response
+        other_learner = sample_learner.model_copy(update={"age": 9})
+
+        async def generate_both():
+            return await asyncio.gather(
+                quiz_service.agenerate_quiz(sample_learner),
+                quiz_service.agenerate_quiz(other_learner),
+            )
+
+        first, second = asyncio.run(generate_both())
+
+        expected = [QuizQuestion(**q) for q in sample_quiz_response["questions"]]
+        assert first == expected
+        assert second == expected
+        assert mock_llm_service.agenerate_json_content.call_count == 2
+
+    def test_agenerate_quiz_error_handling(
+        self, quiz_service, mock_llm_service, sample_learner
+    ):
+        """Test error handling during asynchronous quiz generation."""
+        mock_llm_service.agenerate_json_content.side_effect = Exception("API error")
+
+        quiz = asyncio.run(quiz_service.agenerate_quiz(sample_learner))
+
+        assert len(quiz) == 3
+        assert PLACEHOLDER_RE.search(quiz[0].explanation)
+
+    def test_igenerate_quiz_yields_first_question_early(
+        self,
+        quiz_service,
+        mock_llm_service,
+        sample_learner,
+        sample_quiz_json,
+        sample_quiz_response,
+    ):
+        """Test that the first question is available before the stream ends."""
+        text = sample_quiz_json.decode("utf-8")
+        chunks = iter([text[i : i + 16] for i in range(0, len(text), 16)])
+        mock_llm_service.stream_json_content.return_value = chunks
+
+        question = next(quiz_service.igenerate_quiz(sample_learner))
+
+        mock_llm_service.stream_json_content.assert_called_once()
+        assert type(question) is QuizQuestion
+        assert question.question == sample_quiz_response["questions"][0]["question"]
+        # The later questions have not been read from the stream yet
+        assert next(chunks, None) is not None
+
+    def test_igenerate_quiz_yields_every_question(
+        self,
+        quiz_service,
+        mock_llm_service,
+        sample_learner,
+        sample_quiz_json,
+        sample_quiz_response,
+    ):
+        """Test that streaming produces the same quiz as generate_quiz."""
+        text = sample_quiz_json.decode("utf-8")
+        mock_llm_service.stream_json_content.return_value = list(text)
+
+        quiz = list(quiz_service.igenerate_quiz(sample_learner))
+
+        expected = [QuizQuestion(**q) for q in sample_quiz_response["questions"]]
+        assert quiz == expected
+
+    def test_igenerate_quiz_error_handling(
+        self, quiz_service, mock_llm_service, sample_learner
+    ):
+        """Test that a stream failing before any question yields the fallback."""
+        mock_llm_service.stream_json_content.side_effect = Exception("API error")
+
+        quiz = list(quiz_service.igenerate_quiz(sample_learner))
+
+        assert len(quiz) == 3
+        assert PLACEHOLDER_RE.search(quiz[0].explanation)
+
+    def test_generate_quiz_is_cached_per_profile(
+        self, sample_learner, sample_quiz_response
+    ):
+        """Test that a repeated profile is served from the quiz cache."""
+        mock_llm_service = stub_llm(return_value=sample_quiz_response)
+        quiz_service = QuizService(mock_llm_service)
+
+        first = quiz_service.generate_quiz(sample_learner)
+        second = quiz_service.generate_quiz(sample_learner)
+
+        assert mock_llm_service.generate_json_content.call_count == 1
+        assert second == first
+
+    def test_generate_quiz_cache_can_be_disabled(
+        self, sample_learner, sample_quiz_response
+    ):
+        """Test that a service built with cache=False always calls the LLM."""
+        mock_llm_service = stub_llm(return_value=sample_quiz_response)
+        quiz_service = QuizService(mock_llm_service, cache=False)
+
+        quiz_service.generate_quiz(sample_learner)
+        quiz_service.generate_quiz(sample_learner)
+
+        assert mock_llm_service.generate_json_content.call_count == 2
+
+    def test_generate_quiz_uses_quiz_model(self, sample_learner):
+        """Test that quizzes are generated with the configured quiz model."""
+        mock_llm_service = stub_llm(return_value={"questions": []})
+        config = dict(get_default_config(), quiz_model="quiz-model")
+
+        QuizService(mock_llm_service, config=config).generate_quiz(sample_learner)
+
+        kwargs = mock_llm_service.generate_json_content.call_args.kwargs
+        assert kwargs["model"] == "quiz-model"
@@ -0,0 +1,136 @@
+"""
+Tests for the data models.
+
+This module contains tests that verify the validation behavior of the
+Pydantic models of the seek-core package.
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from seek_core.models.schemas import LearnerProfile, MicroLesson
+
+
+class TestLearnerProfile:
+    """Tests for the LearnerProfile model."""
+
+    def test_profile_is_frozen(self, sample_learner):
+        """Test that learner profiles can't be mutated after validation."""
+        with pytest.raises(ValidationError):
+            sample_learner.age = 13
+
+    def test_strips_whitespace(self):
+        """Test that string fields are stripped during validation."""
+        learner = LearnerProfile.model_validate(
+            {
+                "age": 12,
+                "grade_level": 6,
+                "learning_style": " visual ",
+                "goal": " learn fractions\n",
+            }
+        )
+
+        assert learner.learning_style == "visual"
+        assert learner.goal == "learn fractions"
+
+    def test_normalizes_topics(self):
+        """Test that topic lists are stripped, lowercased and de-duplicated."""
+        learner = LearnerProfile(
+            age=12,
+            grade_level=6,
+            learning_style="visual",
+            known_topics=["Fractions", " fractions ", "", "Ratios"],
+            goal="learn decimals",
+        )
+
+        assert learner.known_topics == ["fractions", "ratios"]
+
+    def test_cache_key_ignores_topic_order(self):
+        """Test that equivalent profiles share a cache key and hash."""
+        data = {
+            "age": 12,
+            "grade_level": 6,
+            "learning_style": "visual",
+            "known_topics": ["fractions", "ratios"],
+            "goal": "learn decimals",
+        }
+        first = LearnerProfile.model_validate(data)
+        second = LearnerProfile.model_validate(
+            dict(data, known_topics=["Ratios", "fractions"])
+        )
+        other = LearnerProfile.model_validate(dict(data, goal="learn percentages"))
+
+        assert first.cache_key == second.cache_key
+        assert hash(first) == hash(second)
+        assert first.cache_key != other.cache_key
+
+    def test_topic_csv_is_sorted(self):
+        """Test that the joined topic lists don't depend on input order."""
+        learner = LearnerProfile(
+            age=12,
+            grade_level=6,
+            learning_style="visual",
+            known_topics=["ratios", "fractions"],
+            struggles=["percentages", "decimals"],
+            goal="learn decimals",
+        )
+
+        assert learner.known_topics_csv == "fractions, ratios"
+        assert learner.struggles_csv == "decimals, percentages"
+
+    def test_json_payload_is_serialized_once(self, sample_learner):
+        """Test that the canonical JSON payload is computed once and round-trips."""
+        payload = sample_learner.json_payload
+
+        assert sample_learner.json_payload is payload
+        assert json.loads(payload) == dict(
+            sample_learner.model_dump(),
+            known_topics=sorted(sample_learner.known_topics),
+            struggles=sorted(sample_learner.struggles),
+        )
+
+    def test_copy_recomputes_cache_key(self, sample_learner):
+        """Test that a copied profile doesn't inherit the original's cache key."""
+        original_key = sample_learner.cache_key
+        copied = sample_learner.model_copy(update={"goal": "learn percentages"})
+
+        assert copied.cache_key != original_key
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"age": 2},
+            {"grade_level": 13},
+            {"goal": "x" * 501},
+            {"struggles": ["topic %d" % i for i in range(51)]},
+        ],
+    )
+    def test_rejects_out_of_bounds_input(self, overrides):
+        """Test that oversized or out-of-range input is rejected."""
+        data = {
+            "age": 12,
+            "grade_level": 6,
+            "learning_style": "visual",
+            "goal": "learn decimals",
+        }
+        data.update(overrides)
+
+        with pytest.raises(ValidationError):
+            LearnerProfile.model_validate(data)
+
+
+class TestMicroLesson:
+    """Tests for the MicroLesson model."""
+
+    def test_rejects_unknown_fields(self):
+        """Test that unexpected keys in generated lessons are rejected."""
+        with pytest.raises(ValidationError):
+            MicroLesson(
+                title="Fractions",
+                description="Intro",
+                estimated_time_minutes=10,
+                content="Content",
+                difficulty="easy",
+            )
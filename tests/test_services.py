@@ -5,129 +5,175 @@ This module contains tests that verify the functionality of the
 roadmap service component of the seek-core package.
 """
 
-from unittest.mock import MagicMock
+import asyncio
 
 import pytest
 
-from seek_core.llm.openai_service import LLMService
-from seek_core.models.schemas import LearnerProfile, MicroLesson
+from seek_core.models.schemas import MicroLesson
+from seek_core.services.explanation_service import (
+    _STYLE_GUIDANCE,
+    ExplanationService,
+)
 from seek_core.services.roadmap_service import RoadmapService
-
-
-# Sample learner profile for testing
-@pytest.fixture
-def sample_learner_profile():
-    return LearnerProfile(
-        age=12,
-        grade_level=6,
-        learning_style="visual",
-        known_topics=["fractions"],
-        struggles=["decimals", "percentages"],
-        goal="master converting between decimals and fractions",
-    )
-
-
-# Sample JSON response from LLM
-@pytest.fixture
-def sample_llm_response():
-    return """
-    [
-        {
-            "title": "Understanding Fractions and Decimals",
-            "description": "Learn how fractions and decimals represent the same concept in different ways",
-            "estimated_time_minutes": 10,
-            "content": "This lesson explores how fractions and decimals are different ways to represent parts of a whole. We'll use visual models to see the connection between them."
-        },
-        {
-            "title": "Converting Simple Fractions to Decimals",
-            "description": "Practice converting basic fractions to their decimal equivalents",
-            "estimated_time_minutes": 12,
-            "content": "In this lesson, we'll learn how to convert fractions to decimals by dividing the numerator by the denominator. We'll start with simple fractions like 1/4, 1/2, and 3/4."
-        },
-        {
-            "title": "Converting Decimals to Fractions",
-            "description": "Learn techniques for converting decimal numbers back to fractions",
-            "estimated_time_minutes": 15,
-            "content": "This lesson teaches strategies for converting decimals to fractions. We'll learn about place value and how to use it to write decimals as fractions."
-        }
-    ]
-    """
+from tests.helpers import PLACEHOLDER_RE, assert_calls_between, stub_llm
 
 
 class TestRoadmapService:
     """Tests for the RoadmapService class."""
 
     def test_generate_roadmap_success(
-        self, sample_learner_profile, sample_llm_response
+        self,
+        roadmap_service,
+        mock_llm_service,
+        sample_learner,
+        sample_llm_response,
     ):
         """Test successful roadmap generation."""
-        # Create a mock LLM service
-        mock_llm_service = MagicMock(spec=LLMService)
+        # Configure the shared stub LLM service
         mock_llm_service.generate_json_content.return_value = sample_llm_response
 
-        # Create the roadmap service with the mock LLM service
-        roadmap_service = RoadmapService(mock_llm_service)
-
         # Generate a roadmap
-        roadmap = roadmap_service.generate_roadmap(sample_learner_profile)
+        roadmap = roadmap_service.generate_roadmap(sample_learner)
 
         # Check that the LLM service was called
-        mock_llm_service.generate_json_content.assert_called_once()
+        assert_calls_between(mock_llm_service.generate_json_content, 1, 1)
 
         # Check that we got the expected number of lessons
         assert len(roadmap) == 3
 
-        # Check that each item is a MicroLesson
-        for lesson in roadmap:
-            assert isinstance(lesson, MicroLesson)
-
-        # Check the content of the first lesson
-        assert roadmap[0].title == "Understanding Fractions and Decimals"
-        assert roadmap[0].estimated_time_minutes == 10
+        # Check every lesson against the response it was built from
+        assert all(type(lesson) is MicroLesson for lesson in roadmap)
+        for lesson, expected in zip(roadmap, sample_llm_response["lessons"]):
+            assert lesson.title == expected["title"]
+            assert lesson.description == expected["description"]
+            assert lesson.estimated_time_minutes == expected["estimated_time_minutes"]
+            assert lesson.content == expected["content"]
 
-    def test_generate_roadmap_error_handling(self, sample_learner_profile):
+    def test_generate_roadmap_error_handling(
+        self, roadmap_service, mock_llm_service, sample_learner
+    ):
         """Test error handling during roadmap generation."""
-        # Create a mock LLM service that raises an exception
-        mock_llm_service = MagicMock(spec=LLMService)
+        # Make the shared stub LLM service raise an exception
         mock_llm_service.generate_json_content.side_effect = Exception("API error")
 
-        # Create the roadmap service with the mock LLM service
-        roadmap_service = RoadmapService(mock_llm_service)
-
         # Generate a roadmap
-        roadmap = roadmap_service.generate_roadmap(sample_learner_profile)
+        roadmap = roadmap_service.generate_roadmap(sample_learner)
 
         # Check that we got a fallback roadmap
         assert len(roadmap) == 3
 
         # Check that each item is a MicroLesson
-        for lesson in roadmap:
-            assert isinstance(lesson, MicroLesson)
+        assert all(type(lesson) is MicroLesson for lesson in roadmap)
 
         # Check that the content indicates it's a fallback
-        assert "placeholder" in roadmap[0].content.lower()
+        assert PLACEHOLDER_RE.search(roadmap[0].content)
+
+    def test_fallback_roadmap_reuses_prebuilt_lessons(
+        self, roadmap_service, mock_llm_service, sample_learner
+    ):
+        """Test that every fallback is a new list of the same frozen lessons."""
+        mock_llm_service.generate_json_content.side_effect = Exception("API error")
+
+        first = roadmap_service.generate_roadmap(sample_learner)
+        second = roadmap_service.generate_roadmap(sample_learner)
+
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_agenerate_roadmap_runs_concurrently(
+        self,
+        roadmap_service,
+        mock_llm_service,
+        sample_learner,
+        sample_llm_response,
+    ):
+        """Test that roadmaps for several learners can be awaited together."""
+        mock_llm_service.agenerate_json_content.return_value = sample_llm_response
+        other_learner = sample_learner.model_copy(update={"age": 9})
+
+        async def generate_both():
+            return await asyncio.gather(
+                roadmap_service.agenerate_roadmap(sample_learner),
+                roadmap_service.agenerate_roadmap(other_learner),
+            )
+
+        first, second = asyncio.run(generate_both())
+
+        expected = [MicroLesson(**lesson) for lesson in sample_llm_response["lessons"]]
+        assert first == expected
+        assert second == expected
+        assert mock_llm_service.agenerate_json_content.call_count == 2
+
+    def test_generate_roadmap_is_cached_per_profile(
+        self, sample_learner, sample_llm_response
+    ):
+        """Test that a repeated profile is served from the roadmap cache."""
+        mock_llm_service = stub_llm(return_value=sample_llm_response)
+        roadmap_service = RoadmapService(mock_llm_service)
+
+        first = roadmap_service.generate_roadmap(sample_learner)
+        second = roadmap_service.generate_roadmap(sample_learner)
+
+        mock_llm_service.generate_json_content.assert_called_once()
+        assert second == first
+
+    def test_fallback_roadmap_is_not_cached(self, sample_learner):
+        """Test that a failed generation is retried on the next call."""
+        mock_llm_service = stub_llm(side_effect=Exception("API error"))
+        roadmap_service = RoadmapService(mock_llm_service)
+
+        roadmap_service.generate_roadmap(sample_learner)
+        roadmap_service.generate_roadmap(sample_learner)
+
+        assert mock_llm_service.generate_json_content.call_count == 2
+
+    def test_prompt_ends_with_student_information(
+        self, roadmap_service, sample_learner
+    ):
+        """Test that prompts for different learners share the static prefix."""
+        other_learner = sample_learner.model_copy(
+            update={"age": 9, "goal": "learn percentages"}
+        )
+
+        prompt, _ = roadmap_service._build_prompts(sample_learner)
+        other_prompt, _ = roadmap_service._build_prompts(other_learner)
+
+        prefix, _, student_info = prompt.partition("STUDENT INFORMATION:")
+        assert other_prompt.startswith(prefix)
+        assert sample_learner.goal in student_info
+
+    def test_prompt_keeps_braces_in_learner_input(
+        self, roadmap_service, sample_learner
+    ):
+        """Test that braces in learner input are not treated as placeholders."""
+        learner = sample_learner.model_copy(update={"goal": "solve {x} + 1"})
+
+        prompt, _ = roadmap_service._build_prompts(learner)
+
+        assert "Learning goal: solve {x} + 1" in prompt
+
+
+# Learning styles and a phrase their explanation guidance should contain, with
+# short ids so a single case can be selected with `pytest -k`
+_STYLE_CASES = [
+    pytest.param("visual", "visual", id="visual"),
+    pytest.param("auditory", "dialogue", id="auditory"),
+    pytest.param("kinesthetic", "hands-on", id="kinesthetic"),
+    pytest.param("Tactile learner", "hands-on", id="tactile"),
+    pytest.param("read/write", "written", id="rw"),
+    pytest.param("unknown", "variety", id="unknown"),
+]
 
 
 # Add tests for ExplanationService
 class TestExplanationService:
     """Tests for the ExplanationService class."""
 
-    @pytest.mark.parametrize(
-        "learning_style,expected_content",
-        [
-            ("visual", "visual"),
-            ("auditory", "dialogue"),
-            ("kinesthetic", "hands-on"),
-            ("read/write", "written"),
-            ("unknown", "variety"),
-        ],
-    )
+    @pytest.mark.parametrize("learning_style,expected_content", _STYLE_CASES)
     def test_learning_style_guidance(self, learning_style, expected_content):
         """Test that learning style guidance contains appropriate content."""
-        from seek_core.services.explanation_service import ExplanationService
-
-        # Create a mock LLM service
-        mock_llm_service = MagicMock(spec=LLMService)
+        # Create a stub LLM service
+        mock_llm_service = stub_llm()
 
         # Create the explanation service with the mock LLM service
         explanation_service = ExplanationService(mock_llm_service)
@@ -137,3 +183,39 @@ class TestExplanationService:
 
         # Check that the guidance contains the expected content
         assert expected_content in guidance.lower()
+
+    @pytest.mark.parametrize("learning_style", list(_STYLE_GUIDANCE))
+    def test_canonical_style_guidance_comes_from_table(self, learning_style):
+        """Test that canonical style names map straight to their table entry."""
+        explanation_service = ExplanationService(stub_llm())
+
+        guidance = explanation_service._get_learning_style_guidance(
+            learning_style.upper()
+        )
+
+        assert guidance is _STYLE_GUIDANCE[learning_style]
+
+    def test_explanation_stream_falls_back_on_error(self, sample_learner):
+        """Test that a stream failing before any text yields the fallback."""
+        mock_llm_service = stub_llm(side_effect=Exception("API error"))
+        explanation_service = ExplanationService(mock_llm_service)
+
+        parts = list(explanation_service.generate_explanation_stream(sample_learner))
+
+        assert len(parts) == 1
+        assert "sorry" in parts[0].lower()
+
+    @pytest.mark.parametrize(
+        "learning_style, has_link",
+        [("visual", True), ("Visual", True), ("auditory", False)],
+    )
+    def test_resource_link_only_for_visual_learners(
+        self, sample_learner, learning_style, has_link
+    ):
+        """Test that only visual learners get a resource link."""
+        explanation_service = ExplanationService(stub_llm())
+        learner = sample_learner.model_copy(update={"learning_style": learning_style})
+
+        link = explanation_service.generate_resource_link(learner)
+
+        assert (link is not None) == has_link